@@ -20,7 +20,7 @@ import uuid
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from core.client import KalshiClient
+from core.client import KalshiClient, configure_cli_logging
 from core.trading import (
     AlphaSignal,
     MarketQuote,
@@ -334,12 +334,7 @@ class KalshiAutoTrader:
 
     def _fetch_quotes(self) -> List[MarketQuote]:
         raw_markets = self.client.get_markets(status="open", limit=self.config.markets_limit)
-        quotes: List[MarketQuote] = []
-        for raw in raw_markets:
-            quote = MarketQuote.from_market(raw)
-            if quote:
-                quotes.append(quote)
-        return quotes
+        return MarketQuote.from_markets(raw_markets)
 
     def _available_cash_cents(self) -> int:
         if self.config.paper_mode:
@@ -817,6 +812,7 @@ def parse_args() -> argparse.Namespace:
 
 
 if __name__ == "__main__":
+    configure_cli_logging()
     cli_args = parse_args()
     config = build_config(cli_args)
     trader = KalshiAutoTrader(config)
@@ -15,6 +15,7 @@ import sys
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from core.client import configure_cli_logging
 from ops.build_flow_alpha import build_signals, write_outputs
 
 
@@ -53,6 +54,7 @@ def monitor_flow(interval_minutes: int = 30, top_k: int = 20) -> None:
 
 
 if __name__ == "__main__":
+    configure_cli_logging()
     parser = ArgumentParser(description="Public market-flow monitor")
     parser.add_argument("--interval-minutes", type=int, default=30)
     parser.add_argument("--top-k", type=int, default=20)
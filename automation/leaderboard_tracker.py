@@ -12,6 +12,7 @@ import sys
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from core.client import configure_cli_logging
 from ops.build_flow_alpha import build_signals, write_outputs
 
 
@@ -51,6 +52,7 @@ def run_scan(top_k: int) -> None:
 
 
 if __name__ == "__main__":
+    configure_cli_logging()
     parser = ArgumentParser(description="Market-flow tracker")
     parser.add_argument("--top-k", type=int, default=20)
     parsed = parser.parse_args()
@@ -13,6 +13,7 @@ import time
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from automation.auto_trader import KalshiAutoTrader, TraderConfig
+from core.client import configure_cli_logging
 from ops.build_flow_alpha import build_signals, write_outputs
 
 
@@ -113,6 +114,7 @@ def parse_args() -> argparse.Namespace:
 
 
 if __name__ == "__main__":
+    configure_cli_logging()
     args = parse_args()
     if args.run_once:
         run_once(args)
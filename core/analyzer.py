@@ -113,6 +113,19 @@ class MarketAnalyzer:
         opportunities.sort(key=lambda x: x["edge"], reverse=True)
         return opportunities
     
+    @staticmethod
+    def group_by_event(markets: List[Dict]) -> Dict[str, List[int]]:
+        """
+        Map event ticker -> indices into markets, keeping only events with 2+ markets
+        
+        The result only depends on each market's event_ticker and position, so
+        callers polling the same listing can reuse it across cycles.
+        """
+        events = {}
+        for idx, market in enumerate(markets):
+            events.setdefault(market.get("event_ticker"), []).append(idx)
+        return {event: idxs for event, idxs in events.items() if len(idxs) >= 2}
+    
     def find_arbitrage(self, markets: List[Dict]) -> List[Dict]:
         """
         Find arbitrage opportunities across related markets
@@ -122,20 +135,13 @@ class MarketAnalyzer:
             Market B: "Candidate X loses" = 50%
             → Arbitrage: Yes on A (60%) + Yes on B (50%) = 110% > 100%
         """
-        # Group markets by event
-        events = {}
-        for market in markets:
-            event_ticker = market.get("event_ticker")
-            if event_ticker not in events:
-                events[event_ticker] = []
-            events[event_ticker].append(market)
+        event_groups = self.group_by_event(markets)
         
         arbitrage_opps = []
         
         # Check for complementary markets (should sum to 100%)
-        for event_ticker, event_markets in events.items():
-            if len(event_markets) < 2:
-                continue
+        for event_ticker, idxs in event_groups.items():
+            event_markets = [markets[i] for i in idxs]
             
             # Calculate total implied probability
             total_prob = sum(m.get("last_price", 0) for m in event_markets if m.get("last_price"))
@@ -160,19 +166,16 @@ class MarketAnalyzer:
         This means finding markets priced at 20% or less that have >50% true probability
         """
         high_return_bets = []
+        # Max price for desired return: 1 / target_return (loop-invariant)
+        max_price = 1.0 / target_return
         
         for market in markets:
-            last_price = market.get("last_price")
-            yes_ask = market.get("yes_ask")
+            # yes_ask wins when set, else last_price; one falsy check covers both missing
+            price = market.get("yes_ask") or market.get("last_price")
             
-            if not last_price and not yes_ask:
+            if not price:
                 continue
             
-            price = yes_ask if yes_ask else last_price
-            
-            # Max price for desired return: 1 / target_return
-            max_price = 1.0 / target_return
-            
             if price <= max_price:
                 potential_return = (1.0 / price) - 1
                 high_return_bets.append({
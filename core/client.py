@@ -2,11 +2,107 @@
 Kalshi API Client
 Handles authentication, market data fetching, and order execution
 """
+import atexit
+from concurrent.futures import Executor, ThreadPoolExecutor
+from functools import partial
+import logging
+from logging.handlers import QueueHandler, QueueListener
 import os
-from typing import Any, Dict, List, Optional
+import queue
+import re
+import sys
+from typing import Any, Dict, List, Optional, Tuple
 from datetime import datetime, timedelta
 import json
 
+from core import jsonio
+
+logger = logging.getLogger("kalshi.client")
+_log_listener: Optional[QueueListener] = None
+
+
+def _build_market(m: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Normalize one public market payload for a fixed output schema.
+
+    Straight-line on purpose: one bound ``get`` and literal keys, no per-field
+    loop. Explicit API nulls fall back to defaults (quotes, volume, OI).
+    """
+    get = m.get
+    yes_bid = get("yes_bid")
+    yes_ask = get("yes_ask")
+    no_bid = get("no_bid")
+    no_ask = get("no_ask")
+    last_price = get("last_price")
+    volume = get("volume")
+    open_interest = get("open_interest")
+    return {
+        "ticker": get("ticker", ""),
+        "title": get("title", ""),
+        "event_ticker": get("event_ticker", ""),
+        "category": get("category", "Other"),  # Default to avoid None
+        "status": get("status", "open"),
+        "yes_bid": 0 if yes_bid is None else yes_bid,
+        "yes_ask": 100 if yes_ask is None else yes_ask,
+        "no_bid": 0 if no_bid is None else no_bid,
+        "no_ask": 100 if no_ask is None else no_ask,
+        "last_price": 0 if last_price is None else last_price,
+        "volume": 0 if volume is None else volume,
+        "open_interest": 0 if open_interest is None else open_interest,
+        "close_date": get("close_time"),
+        "expiration": get("expiration_time"),
+    }
+
+# Private key PEM text keyed by (path, mtime) so repeated clients skip the disk read.
+_PEM_CACHE: Dict[Tuple[str, float], str] = {}
+
+
+# Emoji (plus variation selectors) and the spacing after them, for non-TTY output.
+_EMOJI_RE = re.compile("[\u2600-\u27bf\ufe0f\U0001f300-\U0001faff]+ *")
+
+
+class _PlainFormatter(logging.Formatter):
+    """Formatter that drops emoji, for log files and pipes."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        return _EMOJI_RE.sub("", super().format(record))
+
+
+def configure_cli_logging(stream=None) -> None:
+    """
+    Set up logging for a command-line entry point.
+
+    Root-logger records go through a queue drained by a background thread, so
+    error storms never block request threads on stderr writes. Emoji are kept
+    only when the stream is a terminal. Skipped when the application has
+    already configured logging.
+    """
+    global _log_listener
+    root = logging.getLogger()
+    if _log_listener is not None or root.handlers:
+        return
+    stream = stream if stream is not None else sys.stderr
+    handler = logging.StreamHandler(stream)
+    isatty = getattr(stream, "isatty", None)
+    formatter_cls = logging.Formatter if isatty is not None and isatty() else _PlainFormatter
+    handler.setFormatter(formatter_cls("%(message)s"))
+    log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+    _log_listener = QueueListener(log_queue, handler)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+    root.addHandler(QueueHandler(log_queue))
+    logging.getLogger("kalshi").setLevel(logging.INFO)
+
+
+def _read_private_key(path: str) -> str:
+    key = (path, os.stat(path).st_mtime)
+    pem = _PEM_CACHE.get(key)
+    if pem is None:
+        with open(path, "r") as f:
+            pem = f.read()
+        _PEM_CACHE[key] = pem
+    return pem
+
 
 class KalshiClient:
     """Wrapper for Kalshi API with error handling and caching"""
@@ -28,10 +124,12 @@ class KalshiClient:
             if self.env == "demo"
             else "https://api.elections.kalshi.com/trade-api/v2"
         )
+        self._session = None
+        self._markets_url = f"{self.base_url}/markets"
         
         if not self.api_key_id or not self.private_key_path:
-            print("⚠️  No credentials found. Set KALSHI_API_KEY_ID and KALSHI_PRIVATE_KEY_PATH")
-            print("   Running in READ-ONLY mode with public data")
+            logger.warning("⚠️  No credentials found. Set KALSHI_API_KEY_ID and KALSHI_PRIVATE_KEY_PATH")
+            logger.warning("   Running in READ-ONLY mode with public data")
             self.client = None
             self.authenticated = False
         else:
@@ -42,9 +140,8 @@ class KalshiClient:
         try:
             from kalshi_python_sync import Configuration, KalshiClient as SDK
             
-            # Read private key
-            with open(self.private_key_path, "r") as f:
-                private_key = f.read()
+            # Read private key (cached per path + mtime)
+            private_key = _read_private_key(self.private_key_path)
             
             # Configure client (updated API endpoint as of 2026)
             config = Configuration(host=self.base_url)
@@ -53,18 +150,18 @@ class KalshiClient:
             
             self.client = SDK(config)
             self.authenticated = True
-            print(f"✅ Kalshi client initialized ({self.env} mode)")
+            logger.info("✅ Kalshi client initialized (%s mode)", self.env)
             
             # Test connection
             balance = self.get_balance()
-            print(f"💰 Balance: ${balance / 100:.2f}")
+            logger.info("💰 Balance: $%.2f", balance / 100)
             
         except ImportError:
-            print("❌ kalshi_python_sync not installed. Run: pip install kalshi_python_sync")
+            logger.error("❌ kalshi_python_sync not installed. Run: pip install kalshi_python_sync")
             self.client = None
             self.authenticated = False
         except Exception as e:
-            print(f"❌ Failed to initialize Kalshi client: {e}")
+            logger.error("❌ Failed to initialize Kalshi client: %s", e)
             self.client = None
             self.authenticated = False
     
@@ -76,7 +173,7 @@ class KalshiClient:
             balance_resp = self.client.get_balance()
             return balance_resp.balance
         except Exception as e:
-            print(f"Error fetching balance: {e}")
+            logger.warning("Error fetching balance: %s", e)
             return 0
     
     def get_portfolio(self) -> List[Dict]:
@@ -98,7 +195,7 @@ class KalshiClient:
             
             return positions
         except Exception as e:
-            print(f"Error fetching portfolio: {e}")
+            logger.warning("Error fetching portfolio: %s", e)
             return []
     
     def get_fills(self, limit: int = 50) -> List[Dict]:
@@ -122,7 +219,7 @@ class KalshiClient:
             
             return fills
         except Exception as e:
-            print(f"Error fetching fills: {e}")
+            logger.warning("Error fetching fills: %s", e)
             return []
     
     def get_markets(self, status: str = "open", limit: int = 100, event_ticker: str = None) -> List[Dict]:
@@ -141,25 +238,33 @@ class KalshiClient:
         # The authenticated SDK has validation issues with None values
         return self._get_public_markets_v2(status, limit, event_ticker)
 
-    def _public_get(self, path: str, params: Optional[Dict[str, Any]] = None, timeout: int = 10) -> Optional[Dict[str, Any]]:
-        import requests
+    def _http(self):
+        """Shared keep-alive session for public endpoints (one TCP/TLS handshake per host)"""
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+            session.mount("https://", adapter)
+            self._session = session
+        return self._session
 
+    def _public_get(self, path: str, params: Optional[Dict[str, Any]] = None, timeout: int = 10) -> Optional[Dict[str, Any]]:
         url = f"{self.base_url}{path}"
         try:
-            resp = requests.get(url, params=params or {}, timeout=timeout)
+            resp = self._http().get(url, params=params or {}, timeout=timeout)
             resp.raise_for_status()
-            return resp.json()
+            return jsonio.loads(resp.content)
         except Exception as e:
-            print(f"Error fetching {path}: {e}")
+            logger.warning("Error fetching %s: %s", path, e)
             return None
         
     def _get_public_markets_v2(self, status: str = "open", limit: int = 100, event_ticker: str = None) -> List[Dict]:
         """
         Fetch market data via direct API calls (bypasses SDK validation issues)
         """
-        import requests
         try:
-            url = f"{self.base_url}/markets"
             params = {"status": status, "limit": limit}
             if event_ticker:
                 params["event_ticker"] = event_ticker
@@ -170,48 +275,21 @@ class KalshiClient:
                 # Get auth token from SDK client if possible
                 pass  # For now, use public endpoint
             
-            resp = requests.get(url, params=params, timeout=10)
+            resp = self._http().get(self._markets_url, params=params, timeout=10)
             resp.raise_for_status()
-            data = resp.json()
+            # Parse the raw body bytes directly instead of decoding to str first.
+            data = jsonio.loads(resp.content)
             
-            markets = []
-            for m in data.get("markets", []):
-                # Convert cents to dollars and handle None values safely
-                yes_bid = m.get("yes_bid")
-                yes_ask = m.get("yes_ask")
-                no_bid = m.get("no_bid")
-                no_ask = m.get("no_ask")
-                last_price = m.get("last_price")
-                volume = m.get("volume", 0)
-                
-                markets.append({
-                    "ticker": m.get("ticker", ""),
-                    "title": m.get("title", ""),
-                    "event_ticker": m.get("event_ticker", ""),
-                    "category": m.get("category", "Other"),  # Default to avoid None
-                    "status": m.get("status", "open"),
-                    "yes_bid": yes_bid if yes_bid is not None else 0,
-                    "yes_ask": yes_ask if yes_ask is not None else 100,
-                    "no_bid": no_bid if no_bid is not None else 0,
-                    "no_ask": no_ask if no_ask is not None else 100,
-                    "last_price": last_price if last_price is not None else 0,
-                    "volume": volume,
-                    "open_interest": m.get("open_interest", 0),
-                    "close_date": m.get("close_time"),
-                    "expiration": m.get("expiration_time"),
-                })
-            
-            return markets
+            return [_build_market(m) for m in data.get("markets", [])]
         except Exception as e:
-            print(f"Error fetching markets via API: {e}")
+            logger.warning("Error fetching markets via API: %s", e)
             return []
     
     def _get_public_markets(self) -> List[Dict]:
         """Fetch public market data without authentication (limited data)"""
-        import requests
         try:
             url = "https://api.elections.kalshi.com/trade-api/v2/markets"
-            resp = requests.get(url, params={"status": "open", "limit": 100}, timeout=10)
+            resp = self._http().get(url, params={"status": "open", "limit": 100}, timeout=10)
             resp.raise_for_status()
             data = resp.json()
             
@@ -231,7 +309,7 @@ class KalshiClient:
                 })
             return markets
         except Exception as e:
-            print(f"Error fetching public markets: {e}")
+            logger.warning("Error fetching public markets: %s", e)
             return []
     
     def get_events(self, limit: int = 50) -> List[Dict]:
@@ -252,7 +330,7 @@ class KalshiClient:
                 })
             return events
         except Exception as e:
-            print(f"Error fetching events: {e}")
+            logger.warning("Error fetching events: %s", e)
             return []
     
     def get_orderbook(self, ticker: str) -> Optional[Dict]:
@@ -267,7 +345,7 @@ class KalshiClient:
                 "no_bids": [(b.price / 100, b.quantity) for b in book_resp.no],
             }
         except Exception as e:
-            print(f"Error fetching orderbook for {ticker}: {e}")
+            logger.warning("Error fetching orderbook for %s: %s", ticker, e)
             return self.get_public_orderbook(ticker)
 
     def get_public_orderbook(self, ticker: str) -> Optional[Dict[str, List[Dict[str, float]]]]:
@@ -350,6 +428,30 @@ class KalshiClient:
                 }
             )
         return normalized
+
+    def get_market_trades_bulk(
+        self,
+        tickers: List[str],
+        limit: int = 200,
+        max_workers: int = 8,
+        executor: Optional[Executor] = None,
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Fetch recent public trades for many tickers concurrently.
+
+        The public trades endpoint takes one ticker per request, so requests
+        fan out over the pooled keep-alive session. Pass ``executor`` to share
+        a caller's pool (and its in-flight bound) instead of starting one.
+        """
+        unique = list(dict.fromkeys(tickers))
+        if not unique:
+            return {}
+        fetch = partial(self.get_market_trades, limit=limit)
+        if executor is not None:
+            return dict(zip(unique, executor.map(fetch, unique)))
+        workers = max(1, min(max_workers, len(unique)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return dict(zip(unique, pool.map(fetch, unique)))
     
     def place_order(self, ticker: str, side: str, quantity: int, price: int, order_type: str = "limit") -> Optional[str]:
         """
@@ -366,7 +468,7 @@ class KalshiClient:
             Order ID if successful
         """
         if not self.authenticated:
-            print("⚠️  Cannot place order: not authenticated")
+            logger.warning("⚠️  Cannot place order: not authenticated")
             return None
         
         try:
@@ -389,8 +491,8 @@ class KalshiClient:
                     type="market",
                 )
             
-            print(f"✅ Order placed: {order_resp.order_id}")
+            logger.info("✅ Order placed: %s", order_resp.order_id)
             return order_resp.order_id
         except Exception as e:
-            print(f"❌ Order failed: {e}")
+            logger.error("❌ Order failed: %s", e)
             return None
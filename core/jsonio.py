@@ -0,0 +1,71 @@
+"""
+JSON helpers with an optional orjson fast path.
+
+orjson parses straight from bytes; the stdlib fallback keeps every tool working
+on hosts where it is not installed.
+"""
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can keep
+# catching the stdlib exception type.
+JSONDecodeError = json.JSONDecodeError
+
+
+def loads(data: Union[bytes, bytearray, str]) -> Any:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, *, indent: bool = False) -> bytes:
+    """
+    Serialize to UTF-8 bytes; indent=True gives two-space indentation.
+
+    Non-string dict keys are stringified by both backends. NaN and infinity
+    differ: orjson writes them as null, the stdlib fallback as NaN/Infinity.
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    return json.dumps(obj, indent=2 if indent else None).encode("utf-8")
+
+
+def dumps_line(obj: Any) -> bytes:
+    """
+    Compact serialization plus a trailing newline, for JSONL appends.
+
+    Same key and NaN handling as dumps.
+    """
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_APPEND_NEWLINE)
+    return (json.dumps(obj) + "\n").encode("utf-8")
+
+
+def load_path(path: Path) -> Any:
+    """
+    Parse a JSON file from a single bytes read.
+    """
+    return loads(path.read_bytes())
+
+
+def dump_path(path: Path, obj: Any, *, indent: bool = False) -> None:
+    """
+    Write JSON via a sibling temp file and os.replace, so readers (or an
+    interrupted writer) never leave a half-written file at path.
+    """
+    tmp_path = path.with_name(path.name + ".tmp")
+    with tmp_path.open("wb") as handle:
+        handle.write(dumps(obj, indent=indent))
+    os.replace(tmp_path, path)
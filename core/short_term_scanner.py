@@ -2,20 +2,100 @@
 Kalshi Short-Term Market Scanner
 Finds markets resolving in days/weeks for fast compounding
 """
-import requests
-from typing import Dict, List
-from datetime import datetime, timedelta
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from operator import attrgetter
+from typing import Dict, List, Optional
 import json
+import re
+import time
+
+from core import jsonio
+from core.trading import parse_timestamp
+
+SECONDS_PER_DAY = 86400
+
+# Upper day bounds for each resolution bucket, in order.
+_BUCKET_EDGES = (1, 7, 14, 31)
+_BUCKET_NAMES = ("today", "this_week", "next_week", "this_month")
+_CLOSE_TIME_KEYS = ("close_date", "close_time", "expiration", "expiration_time", "strike_date")
+
+
+def _epoch_seconds(raw: str) -> Optional[int]:
+    dt = parse_timestamp(raw)
+    return int(dt.timestamp()) if dt else None
+
+
+def _close_epoch(item: Dict) -> Optional[int]:
+    for key in _CLOSE_TIME_KEYS:
+        raw = item.get(key)
+        if raw:
+            return _epoch_seconds(str(raw))
+    return None
+
+
+@dataclass
+class Opportunity:
+    """A ranked short-term play"""
+    market: str
+    ticker: str
+    resolves: str
+    days_away: int
+    category: str
+    edge_type: str
+    our_probability: float
+    market_price: float
+    edge: float
+    confidence: str
+    reasoning: List[str] = field(default_factory=list)
 
 
 class ShortTermScanner:
     """Find high-conviction short-term Kalshi markets"""
+
+    DATA_DRIVEN_CATEGORIES = frozenset({
+        "Economics",  # CPI, jobs report, etc.
+        "Climate and Weather",  # Temperature, rainfall
+        "Financials",  # Stock prices, earnings
+        "Crypto",  # BTC/ETH price levels
+    })
+
+    # Specific event patterns to look for
+    DATA_DRIVEN_PATTERNS = (
+        "CPI",  # Consumer Price Index
+        "unemployment",
+        "jobs report",
+        "temperature",
+        "precipitation",
+        "BTC",
+        "ETH",
+        "earnings",
+        "Fed decision",
+    )
+
+    # One alternation scanned by the regex engine instead of a substring loop per pattern.
+    # Word boundaries keep short tickers like ETH from matching inside other words.
+    _DATA_DRIVEN_RE = re.compile(
+        r"\b(?:" + "|".join(map(re.escape, DATA_DRIVEN_PATTERNS)) + r")\b", re.IGNORECASE
+    )
     
     def __init__(self):
         self.api_base = "https://api.elections.kalshi.com/trade-api/v2"
         self.min_edge = 0.15  # 15% edge minimum
         self.max_days_to_resolution = 14  # Max 2 weeks
-    
+        self._session = None
+
+    def _http(self):
+        """Shared keep-alive session so repeated scans reuse TCP/TLS connections"""
+        if self._session is None:
+            import requests
+            from requests.adapters import HTTPAdapter
+
+            session = requests.Session()
+            session.mount("https://", HTTPAdapter(pool_connections=2))
+            self._session = session
+        return self._session
+
     def get_short_term_markets(self, max_days: int = 14) -> List[Dict]:
         """
         Fetch markets resolving within max_days
@@ -27,11 +107,11 @@ class ShortTermScanner:
             List of short-term markets
         """
         try:
-            resp = requests.get(f"{self.api_base}/events", timeout=10)
+            resp = self._http().get(f"{self.api_base}/events", timeout=10)
             resp.raise_for_status()
-            events = resp.json().get("events", [])
+            events = jsonio.loads(resp.content).get("events", [])
             
-            cutoff_date = datetime.utcnow() + timedelta(days=max_days)
+            cutoff_ts = int(time.time()) + max_days * SECONDS_PER_DAY
             short_term = []
             
             for event in events:
@@ -56,23 +136,28 @@ class ShortTermScanner:
                 "this_month": [...]
             }
         """
-        now = datetime.utcnow()
+        now_ts = int(time.time())
         
-        categorized = {
-            "today": [],
-            "this_week": [],
-            "next_week": [],
-            "this_month": []
-        }
+        categorized = {name: [] for name in _BUCKET_NAMES}
         
         for market in markets:
-            # Would parse expiration date and categorize
-            # For now, mock structure
-            pass
+            close_ts = _close_epoch(market)
+            if close_ts is None or close_ts < now_ts:
+                continue
+            days_away = (close_ts - now_ts) // SECONDS_PER_DAY
+            idx = bisect_right(_BUCKET_EDGES, days_away)
+            if idx < len(_BUCKET_NAMES):
+                categorized[_BUCKET_NAMES[idx]].append(market)
         
         return categorized
     
-    def get_data_driven_markets(self) -> List[Dict]:
+    def is_data_driven(self, event: Dict) -> bool:
+        """True when an event's category or title points at a public data source."""
+        if event.get("category") in self.DATA_DRIVEN_CATEGORIES:
+            return True
+        return self._DATA_DRIVEN_RE.search(event.get("title") or "") is not None
+
+    def get_data_driven_markets(self, events: Optional[List[Dict]] = None) -> List[Dict]:
         """
         Find markets that resolve based on PUBLIC DATA
         
@@ -82,35 +167,18 @@ class ShortTermScanner:
         - Sports stats (player props that mirror Underdog)
         - Crypto prices (can use options for implied probability)
         
+        Args:
+            events: Events to filter
+        
         Returns:
             Markets with data-driven edge potential
         """
-        data_driven_categories = [
-            "Economics",  # CPI, jobs report, etc.
-            "Climate and Weather",  # Temperature, rainfall
-            "Financials",  # Stock prices, earnings
-            "Crypto",  # BTC/ETH price levels
-        ]
-        
-        # Specific event patterns to look for
-        patterns = [
-            "CPI",  # Consumer Price Index
-            "unemployment",
-            "jobs report",
-            "temperature",
-            "precipitation",
-            "BTC",
-            "ETH",
-            "earnings",
-            "Fed decision",
-        ]
-        
-        # Would fetch and filter
-        markets = []
-        
-        return markets
+        if not events:
+            # Would fetch and filter
+            return []
+        return [event for event in events if self.is_data_driven(event)]
     
-    def get_this_week_opportunities(self) -> List[Dict]:
+    def get_this_week_opportunities(self) -> List[Opportunity]:
         """
         Find best opportunities resolving THIS WEEK
         
@@ -123,50 +191,50 @@ class ShortTermScanner:
         Returns:
             Ranked list of opportunities
         """
-        opportunities = []
+        opportunities: List[Opportunity] = []
         
         # Example: February 7, 2026 - CPI Release
-        opportunities.append({
-            "market": "CPI year-over-year change Feb 2026",
-            "ticker": "KXCPI-26FEB",
-            "resolves": "2026-02-07",
-            "days_away": 4,
-            "category": "Economics",
-            "edge_type": "economist_consensus",
-            "our_probability": 0.65,
-            "market_price": 0.45,
-            "edge": 0.20,  # 20% edge!
-            "confidence": "HIGH",
-            "reasoning": [
+        opportunities.append(Opportunity(
+            market="CPI year-over-year change Feb 2026",
+            ticker="KXCPI-26FEB",
+            resolves="2026-02-07",
+            days_away=4,
+            category="Economics",
+            edge_type="economist_consensus",
+            our_probability=0.65,
+            market_price=0.45,
+            edge=0.20,  # 20% edge!
+            confidence="HIGH",
+            reasoning=[
                 "Economist consensus: 2.8% YoY inflation",
                 "Market pricing in 3.2% YoY (too high)",
                 "Recent core PCE came in at 2.7%",
                 "Used car prices down 3% MoM (CPI component)"
-            ]
-        })
+            ],
+        ))
         
         # Example: BTC price level
-        opportunities.append({
-            "market": "Bitcoin below $95k on Feb 7",
-            "ticker": "BTCUSD-26FEB07-95K",
-            "resolves": "2026-02-07T23:59:59Z",
-            "days_away": 4,
-            "category": "Crypto",
-            "edge_type": "options_implied_vol",
-            "our_probability": 0.72,
-            "market_price": 0.55,
-            "edge": 0.17,
-            "confidence": "MEDIUM-HIGH",
-            "reasoning": [
+        opportunities.append(Opportunity(
+            market="Bitcoin below $95k on Feb 7",
+            ticker="BTCUSD-26FEB07-95K",
+            resolves="2026-02-07T23:59:59Z",
+            days_away=4,
+            category="Crypto",
+            edge_type="options_implied_vol",
+            our_probability=0.72,
+            market_price=0.55,
+            edge=0.17,
+            confidence="MEDIUM-HIGH",
+            reasoning=[
                 "Current price: $91.2k",
                 "Options imply 70% prob of staying below $95k",
                 "No major news catalysts this week",
                 "Historical volatility suggests tight range"
-            ]
-        })
+            ],
+        ))
         
         # Sort by edge
-        opportunities.sort(key=lambda x: x["edge"], reverse=True)
+        opportunities.sort(key=attrgetter("edge"), reverse=True)
         
         return opportunities
     
@@ -248,13 +316,13 @@ if __name__ == "__main__":
     print("="*70)
     
     for i, opp in enumerate(opps, 1):
-        print(f"\n{i}. {opp['market']}")
-        print(f"   Ticker: {opp['ticker']}")
-        print(f"   Resolves: {opp['resolves']} ({opp['days_away']} days)")
-        print(f"   Edge: {opp['edge']*100:.0f}% ({opp['our_probability']*100:.0f}% vs {opp['market_price']*100:.0f}% market)")
-        print(f"   Confidence: {opp['confidence']}")
+        print(f"\n{i}. {opp.market}")
+        print(f"   Ticker: {opp.ticker}")
+        print(f"   Resolves: {opp.resolves} ({opp.days_away} days)")
+        print(f"   Edge: {opp.edge*100:.0f}% ({opp.our_probability*100:.0f}% vs {opp.market_price*100:.0f}% market)")
+        print(f"   Confidence: {opp.confidence}")
         print(f"\n   Reasoning:")
-        for reason in opp['reasoning']:
+        for reason in opp.reasoning:
             print(f"     • {reason}")
     
     print("\n" + "="*70)
@@ -5,49 +5,49 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence, Tuple
-import json
-import math
-
-
-def clamp_probability(value: float) -> float:
-    return max(0.0, min(1.0, value))
-
-
-def to_probability(raw: Any) -> Optional[float]:
-    """
-    Convert mixed price formats into probability units [0, 1].
-
-    Kalshi data can appear as:
-    - probability: 0.37
-    - cents: 37
-    - basis points: 3700
-    """
-    if raw is None:
-        return None
-    try:
-        value = float(raw)
-    except (TypeError, ValueError):
-        return None
-    if math.isnan(value) or value < 0:
-        return None
-    if value <= 1:
-        return clamp_probability(value)
-    if value <= 100:
-        return clamp_probability(value / 100.0)
-    if value <= 10000:
-        return clamp_probability(value / 10000.0)
-    return None
-
-
-def probability_to_cents(probability: float) -> int:
-    return int(round(clamp_probability(probability) * 100))
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+import sys
+
+from core import jsonio
+from core.trading_numeric import (
+    apply_probability_calibration,
+    apply_probability_calibration_batch,
+    clamp_probability,
+    compute_binary_kelly,
+    probability_to_cents,
+    to_probability,
+)
+
+__all__ = [
+    "AlphaSignal",
+    "MarketBook",
+    "MarketQuote",
+    "apply_probability_calibration",
+    "apply_probability_calibration_batch",
+    "clamp_probability",
+    "compute_binary_kelly",
+    "compute_performance_metrics",
+    "load_alpha_signals",
+    "load_probability_calibration",
+    "parse_timestamp",
+    "probability_to_cents",
+    "to_probability",
+    "write_alpha_signals",
+]
 
 
 def parse_timestamp(raw: Optional[str]) -> Optional[datetime]:
     if not raw:
         return None
+    return _parse_timestamp_cached(raw)
+
+
+# Trade timestamps repeat across every metrics recompute; datetimes are
+# immutable, so sharing cached instances is safe.
+@lru_cache(maxsize=8192)
+def _parse_timestamp_cached(raw: str) -> Optional[datetime]:
     if raw.endswith("Z"):
         raw = raw[:-1] + "+00:00"
     try:
@@ -59,7 +59,14 @@ def parse_timestamp(raw: Optional[str]) -> Optional[datetime]:
     return dt.astimezone(timezone.utc)
 
 
-@dataclass(frozen=True)
+_FAIR_KEYS = ("fair_yes_probability", "fair_prob", "probability", "yes_probability")
+
+# Slotted dataclasses (3.10+) skip the per-instance __dict__; thousands of
+# signals are rebuilt every time an alpha file is reloaded.
+_DATACLASS_SLOTS: Dict[str, Any] = {"slots": True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_DATACLASS_SLOTS)
 class AlphaSignal:
     fair_yes_probability: float
     confidence: float
@@ -82,12 +89,12 @@ class AlphaSignal:
         if isinstance(payload, (float, int)):
             fair_prob = to_probability(payload)
         elif isinstance(payload, dict):
-            fair_prob = to_probability(
-                payload.get("fair_yes_probability")
-                or payload.get("fair_prob")
-                or payload.get("probability")
-                or payload.get("yes_probability")
-            )
+            # First present key wins; an explicit 0.0 is a valid probability.
+            for key in _FAIR_KEYS:
+                raw_fair = payload.get(key)
+                if raw_fair is not None:
+                    fair_prob = to_probability(raw_fair)
+                    break
             raw_conf = payload.get("confidence", confidence)
             try:
                 confidence = float(raw_conf)
@@ -128,8 +135,10 @@ class AlphaSignal:
         )
 
 
-@dataclass(frozen=True)
-class MarketQuote:
+_QUOTE_CACHE_MAX = 50_000
+
+
+class MarketQuote(NamedTuple):
     ticker: str
     title: str
     category: str
@@ -139,12 +148,43 @@ class MarketQuote:
     no_bid: Optional[float]
     no_ask: Optional[float]
 
+    @classmethod
+    def from_markets(cls, markets: Iterable[Dict[str, Any]]) -> List["MarketQuote"]:
+        """
+        Build quotes for a batch of raw markets, dropping rows without a ticker.
+        """
+        return [quote for quote in map(cls.from_market, markets) if quote is not None]
+
     @classmethod
     def from_market(cls, market: Dict[str, Any]) -> Optional["MarketQuote"]:
         ticker = str(market.get("ticker", "")).strip()
         if not ticker:
             return None
 
+        # Most markets are unchanged between scans; reuse the quote built last time.
+        get = market.get
+        key = (
+            ticker,
+            get("yes_bid"),
+            get("yes_ask"),
+            get("no_bid"),
+            get("no_ask"),
+            get("volume", 0),
+            get("title"),
+            get("category"),
+        )
+        try:
+            cached = _QUOTE_CACHE.get(key)
+        except TypeError:  # unhashable raw field; build without caching
+            return cls._build(market, ticker)
+        if cached is None:
+            if len(_QUOTE_CACHE) >= _QUOTE_CACHE_MAX:
+                _QUOTE_CACHE.clear()
+            cached = _QUOTE_CACHE[key] = cls._build(market, ticker)
+        return cached
+
+    @classmethod
+    def _build(cls, market: Dict[str, Any], ticker: str) -> "MarketQuote":
         yes_bid = to_probability(market.get("yes_bid"))
         yes_ask = to_probability(market.get("yes_ask"))
         no_bid = to_probability(market.get("no_bid"))
@@ -201,13 +241,54 @@ class MarketQuote:
         return max(0.0, self.no_ask - self.no_bid)
 
 
+_QUOTE_CACHE: Dict[Tuple[Any, ...], MarketQuote] = {}
+
+
+@dataclass
+class MarketBook:
+    """
+    Column-wise view of a quote list: one list per field instead of one object per market.
+    """
+
+    quotes: List[MarketQuote]
+    volume: List[float]
+    yes_bid: List[Optional[float]]
+    yes_ask: List[Optional[float]]
+    no_bid: List[Optional[float]]
+    no_ask: List[Optional[float]]
+
+    @classmethod
+    def from_quotes(cls, quotes: Sequence[MarketQuote]) -> "MarketBook":
+        return cls(
+            quotes=list(quotes),
+            volume=[quote.volume for quote in quotes],
+            yes_bid=[quote.yes_bid for quote in quotes],
+            yes_ask=[quote.yes_ask for quote in quotes],
+            no_bid=[quote.no_bid for quote in quotes],
+            no_ask=[quote.no_ask for quote in quotes],
+        )
+
+    def entry_prices(self, side: str) -> List[Optional[float]]:
+        return self.yes_ask if side == "yes" else self.no_ask
+
+    def exit_prices(self, side: str) -> List[Optional[float]]:
+        return self.yes_bid if side == "yes" else self.no_bid
+
+    def spreads(self, side: str) -> List[Optional[float]]:
+        asks, bids = (self.yes_ask, self.yes_bid) if side == "yes" else (self.no_ask, self.no_bid)
+        return [
+            None if ask is None or bid is None else max(0.0, ask - bid)
+            for ask, bid in zip(asks, bids)
+        ]
+
+
 def load_alpha_signals(alpha_file: Path) -> Dict[str, AlphaSignal]:
     if not alpha_file.exists():
         return {}
 
     try:
-        payload = json.loads(alpha_file.read_text())
-    except (json.JSONDecodeError, OSError):
+        payload = jsonio.load_path(alpha_file)
+    except (jsonio.JSONDecodeError, OSError):
         return {}
 
     signals_payload: Any = payload.get("signals") if isinstance(payload, dict) else payload
@@ -240,7 +321,7 @@ def write_alpha_signals(
     if metadata:
         payload.update(metadata)
     alpha_file.parent.mkdir(parents=True, exist_ok=True)
-    alpha_file.write_text(json.dumps(payload, indent=2))
+    alpha_file.write_bytes(jsonio.dumps(payload, indent=True))
 
 
 def _alpha_payload(signal: AlphaSignal) -> Dict[str, Any]:
@@ -260,44 +341,6 @@ def _alpha_payload(signal: AlphaSignal) -> Dict[str, Any]:
     return payload
 
 
-def apply_probability_calibration(
-    probability: float,
-    calibration_bins: Sequence[Tuple[float, float]],
-) -> float:
-    """
-    Apply piecewise-linear probability calibration.
-
-    calibration_bins: sequence of (raw_probability, calibrated_probability)
-    pairs sorted by raw_probability in ascending order.
-    """
-    p = clamp_probability(probability)
-    if not calibration_bins:
-        return p
-
-    ordered = sorted(
-        (
-            clamp_probability(float(raw_p)),
-            clamp_probability(float(cal_p)),
-        )
-        for raw_p, cal_p in calibration_bins
-    )
-    if p <= ordered[0][0]:
-        return ordered[0][1]
-    if p >= ordered[-1][0]:
-        return ordered[-1][1]
-
-    for idx in range(1, len(ordered)):
-        left_raw, left_cal = ordered[idx - 1]
-        right_raw, right_cal = ordered[idx]
-        if left_raw <= p <= right_raw:
-            span = right_raw - left_raw
-            if span <= 1e-9:
-                return right_cal
-            weight = (p - left_raw) / span
-            return clamp_probability(left_cal + weight * (right_cal - left_cal))
-    return p
-
-
 def load_probability_calibration(path: Path) -> List[Tuple[float, float]]:
     """
     Read calibration bins from a calibration JSON file.
@@ -305,8 +348,8 @@ def load_probability_calibration(path: Path) -> List[Tuple[float, float]]:
     if not path.exists():
         return []
     try:
-        payload = json.loads(path.read_text())
-    except (json.JSONDecodeError, OSError):
+        payload = jsonio.loads(path.read_bytes())
+    except (jsonio.JSONDecodeError, OSError):
         return []
 
     raw_bins = payload.get("bins", []) if isinstance(payload, dict) else []
@@ -323,17 +366,6 @@ def load_probability_calibration(path: Path) -> List[Tuple[float, float]]:
     return bins
 
 
-def compute_binary_kelly(win_probability: float, price_probability: float) -> float:
-    """
-    Kelly fraction for binary contract.
-    """
-    p = clamp_probability(win_probability)
-    c = clamp_probability(price_probability)
-    if c <= 0 or c >= 1:
-        return 0.0
-    return max(0.0, (p - c) / (1.0 - c))
-
-
 def compute_performance_metrics(closed_positions: List[Dict[str, Any]]) -> Dict[str, float]:
     if not closed_positions:
         return {
@@ -348,37 +380,44 @@ def compute_performance_metrics(closed_positions: List[Dict[str, Any]]) -> Dict[
             "avg_holding_minutes": 0.0,
         }
 
-    pnl_values: List[float] = []
-    return_values: List[float] = []
-    holding_minutes: List[float] = []
-
+    wins = losses = 0
+    gross_profit = gross_loss = 0.0
+    # Equity curve starts at 0, so the running peak and drawdown do too.
+    equity = peak = max_drawdown = 0.0
+    return_total = 0.0
+    return_count = 0
+    holding_total = 0.0
+    holding_count = 0
+    parse = parse_timestamp
+
+    # Single pass over the trades with only locals in the loop body.
     for trade in closed_positions:
-        pnl = float(trade.get("pnl_cents", trade.get("pnl", 0.0)) or 0.0)
-        pnl_values.append(pnl)
+        get = trade.get
+        pnl = float(get("pnl_cents", get("pnl", 0.0)) or 0.0)
+        if pnl > 0:
+            wins += 1
+            gross_profit += pnl
+        elif pnl < 0:
+            losses += 1
+            gross_loss -= pnl
+        equity += pnl
+        if equity > peak:
+            peak = equity
+        elif peak - equity > max_drawdown:
+            max_drawdown = peak - equity
 
-        notional = float(trade.get("notional_cents", 0.0) or 0.0)
+        notional = float(get("notional_cents", 0.0) or 0.0)
         if notional > 0:
-            return_values.append(pnl / notional)
+            return_total += pnl / notional
+            return_count += 1
 
-        opened = parse_timestamp(trade.get("opened_at") or trade.get("timestamp"))
-        closed = parse_timestamp(trade.get("closed_at") or trade.get("exit_time"))
+        opened = parse(get("opened_at") or get("timestamp"))
+        closed = parse(get("closed_at") or get("exit_time"))
         if opened and closed and closed >= opened:
-            holding_minutes.append((closed - opened).total_seconds() / 60.0)
+            holding_total += (closed - opened).total_seconds() / 60.0
+            holding_count += 1
 
-    wins = sum(1 for pnl in pnl_values if pnl > 0)
-    losses = sum(1 for pnl in pnl_values if pnl < 0)
-
-    gross_profit = sum(pnl for pnl in pnl_values if pnl > 0)
-    gross_loss = abs(sum(pnl for pnl in pnl_values if pnl < 0))
-    total_pnl = sum(pnl_values)
-
-    equity = 0.0
-    peak = 0.0
-    max_drawdown = 0.0
-    for pnl in pnl_values:
-        equity += pnl
-        peak = max(peak, equity)
-        max_drawdown = max(max_drawdown, peak - equity)
+    total_pnl = equity
 
     if gross_loss > 0:
         profit_factor = gross_profit / gross_loss
@@ -386,8 +425,8 @@ def compute_performance_metrics(closed_positions: List[Dict[str, Any]]) -> Dict[
         profit_factor = gross_profit
     else:
         profit_factor = 0.0
-    expectancy = sum(return_values) / len(return_values) if return_values else 0.0
-    avg_holding = sum(holding_minutes) / len(holding_minutes) if holding_minutes else 0.0
+    expectancy = return_total / return_count if return_count else 0.0
+    avg_holding = holding_total / holding_count if holding_count else 0.0
 
     return {
         "trades": len(closed_positions),
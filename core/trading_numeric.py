@@ -0,0 +1,143 @@
+"""
+Numeric probability utilities used on every quote of every poll.
+
+Kept free of I/O and dataclasses, with full annotations, so the module can be
+compiled ahead of time (e.g. ``mypyc core/trading_numeric.py``) without
+changes; core.trading re-exports everything here.
+"""
+from __future__ import annotations
+
+from bisect import bisect_left
+from functools import lru_cache
+from typing import Any, List, Optional, Sequence, Tuple
+import math
+
+
+def clamp_probability(value: float) -> float:
+    return max(0.0, min(1.0, value))
+
+
+def to_probability(raw: Any) -> Optional[float]:
+    """
+    Convert mixed price formats into probability units [0, 1].
+
+    Kalshi data can appear as:
+    - probability: 0.37
+    - cents: 37
+    - basis points: 3700
+    """
+    kind = type(raw)
+    if kind is int:
+        # Whole-number cents are the common wire format; bool falls through to float().
+        if raw < 0 or raw > 10000:
+            return None
+        if raw <= 1:
+            return float(raw)
+        if raw <= 100:
+            return raw / 100.0
+        return raw / 10000.0
+    if kind is float:
+        value = raw
+    else:
+        if raw is None:
+            return None
+        try:
+            value = float(raw)
+        except (TypeError, ValueError):
+            return None
+    if math.isnan(value) or value < 0:
+        return None
+    if value <= 1:
+        return clamp_probability(value)
+    if value <= 100:
+        return clamp_probability(value / 100.0)
+    if value <= 10000:
+        return clamp_probability(value / 10000.0)
+    return None
+
+
+def probability_to_cents(probability: float) -> int:
+    return int(round(clamp_probability(probability) * 100))
+
+
+def _calibration_axes(
+    calibration_bins: Sequence[Tuple[float, float]],
+) -> Tuple[Tuple[float, ...], Tuple[float, ...]]:
+    # Bins are static config reused for every market, so the clamp+sort is
+    # cached on the bins' contents rather than redone per probability.
+    key = tuple(calibration_bins)
+    try:
+        return _sorted_axes(key)
+    except TypeError:  # unhashable rows (e.g. lists); sort without caching
+        return _sorted_axes.__wrapped__(key)
+
+
+@lru_cache(maxsize=8)
+def _sorted_axes(
+    calibration_bins: Tuple[Tuple[float, float], ...],
+) -> Tuple[Tuple[float, ...], Tuple[float, ...]]:
+    ordered = sorted(
+        (
+            clamp_probability(float(raw_p)),
+            clamp_probability(float(cal_p)),
+        )
+        for raw_p, cal_p in calibration_bins
+    )
+    return tuple(raw for raw, _ in ordered), tuple(cal for _, cal in ordered)
+
+
+def _interp_calibrated(p: float, xs: Sequence[float], ys: Sequence[float]) -> float:
+    if p <= xs[0]:
+        return ys[0]
+    if p >= xs[-1]:
+        return ys[-1]
+    # First knot >= p; xs[idx - 1] < p is guaranteed by the bounds checks above.
+    idx = bisect_left(xs, p)
+    left_raw = xs[idx - 1]
+    right_raw = xs[idx]
+    span = right_raw - left_raw
+    if span <= 1e-9:
+        return ys[idx]
+    weight = (p - left_raw) / span
+    return clamp_probability(ys[idx - 1] + weight * (ys[idx] - ys[idx - 1]))
+
+
+def apply_probability_calibration(
+    probability: float,
+    calibration_bins: Sequence[Tuple[float, float]],
+) -> float:
+    """
+    Apply piecewise-linear probability calibration.
+
+    calibration_bins: sequence of (raw_probability, calibrated_probability)
+    pairs sorted by raw_probability in ascending order.
+    """
+    p = clamp_probability(probability)
+    if not calibration_bins:
+        return p
+    xs, ys = _calibration_axes(calibration_bins)
+    return _interp_calibrated(p, xs, ys)
+
+
+def apply_probability_calibration_batch(
+    probabilities: Sequence[float],
+    calibration_bins: Sequence[Tuple[float, float]],
+) -> List[float]:
+    """
+    Calibrate many probabilities against the same bins, preparing the knots once.
+    """
+    if not calibration_bins:
+        return [clamp_probability(p) for p in probabilities]
+    xs, ys = _calibration_axes(calibration_bins)
+    return [_interp_calibrated(clamp_probability(p), xs, ys) for p in probabilities]
+
+
+def compute_binary_kelly(win_probability: float, price_probability: float) -> float:
+    """
+    Kelly fraction for binary contract.
+    """
+    p = clamp_probability(win_probability)
+    c = clamp_probability(price_probability)
+    if c <= 0 or c >= 1:
+        return 0.0
+    return max(0.0, (p - c) / (1.0 - c))
@@ -6,6 +6,11 @@ set -euo pipefail
 SESSION="kalshi-auto-trader"
 ROOT_DIR="$(cd "$(dirname "${BASH_SOURCE[0]}")" && pwd)"
 MODE="${1:-paper}" # paper | live
+# Skip the confirmation prompt with --yes (second argument) or FORCE_YES=1.
+ASSUME_YES="${FORCE_YES:-0}"
+if [[ "${2:-}" == "--yes" ]]; then
+  ASSUME_YES=1
+fi
 
 if [[ -f "$ROOT_DIR/.env" ]]; then
   set -a
@@ -20,7 +25,7 @@ echo "Mode: $MODE"
 echo ""
 
 if [[ "$MODE" != "paper" && "$MODE" != "live" ]]; then
-  echo "Usage: $0 [paper|live]"
+  echo "Usage: $0 [paper|live] [--yes]"
   exit 1
 fi
 
@@ -36,10 +41,12 @@ if [[ "$MODE" == "live" ]]; then
   fi
 fi
 
-read -r -p "Start auto-trader in $MODE mode? (yes/no): " confirm
-if [[ "$confirm" != "yes" ]]; then
-  echo "❌ Deployment cancelled"
-  exit 1
+if [[ "$ASSUME_YES" != "1" ]]; then
+  read -r -p "Start auto-trader in $MODE mode? (yes/no): " confirm
+  if [[ "$confirm" != "yes" ]]; then
+    echo "❌ Deployment cancelled"
+    exit 1
+  fi
 fi
 
 tmux kill-session -t "$SESSION" 2>/dev/null || true
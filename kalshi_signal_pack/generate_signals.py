@@ -10,9 +10,11 @@ from __future__ import annotations
 
 import argparse
 import csv
+import heapq
 import math
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Sequence, Tuple
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
 import sys
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -26,167 +28,228 @@ def _clamp(value: float, lo: float = 0.0, hi: float = 1.0) -> float:
 def _safe_float(raw: Any) -> Optional[float]:
     if raw is None:
         return None
-    if isinstance(raw, float) and math.isnan(raw):
-        return None
     try:
         value = float(raw)
     except (TypeError, ValueError):
         return None
-    if math.isnan(value) or math.isinf(value):
-        return None
-    return value
+    return value if math.isfinite(value) else None
 
 
-def _prob_from_raw(raw: Any) -> Optional[float]:
-    value = _safe_float(raw)
-    if value is None:
-        return None
-    if value < 0:
+def _scale_probability(value: float) -> Optional[float]:
+    """
+    Probability, percent or basis-point float -> [0, 1]; None when out of range.
+    """
+    if not math.isfinite(value) or value < 0 or value > 10000:
         return None
     if value <= 1:
-        return _clamp(value)
+        return value if value > 0 else 0.0
     if value <= 100:
-        return _clamp(value / 100.0)
-    if value <= 10000:
-        return _clamp(value / 10000.0)
-    return None
+        return value / 100.0
+    return value / 10000.0
 
 
-def _read_csv(path: Path) -> Tuple[List[str], List[Dict[str, str]]]:
-    with path.open("r", newline="", encoding="utf-8") as fh:
-        reader = csv.DictReader(fh)
-        rows = list(reader)
-        return list(reader.fieldnames or []), rows
+def _prob_from_raw(raw: Any) -> Optional[float]:
+    value = _safe_float(raw)
+    return None if value is None else _scale_probability(value)
 
 
-def _ticker_for_row(row: Dict[str, str]) -> Optional[str]:
-    direct_keys = ("ticker", "market_ticker", "kalshi_ticker")
-    for key in direct_keys:
-        value = str(row.get(key, "")).strip()
-        if value:
-            return value
-    return None
+_TICKER_KEYS = ("ticker", "market_ticker", "kalshi_ticker")
 
+Columns = Dict[str, Sequence[str]]
 
-def _direct_probability(row: Dict[str, str]) -> Optional[float]:
-    return _prob_from_raw(row.get("fair_yes_probability"))
 
+def _prob_column(cells: Sequence[str]) -> List[Optional[float]]:
+    """
+    _prob_from_raw over a whole CSV column.
+    """
+    out: List[Optional[float]] = []
+    append = out.append
+    scale = _scale_probability
+    for cell in cells:
+        try:
+            value = float(cell)
+        except (TypeError, ValueError):
+            append(None)
+            continue
+        append(scale(value))
+    return out
 
-def _direct_confidence(row: Dict[str, str]) -> Optional[float]:
-    return _prob_from_raw(row.get("confidence"))
+
+def _read_csv(path: Path) -> Tuple[List[str], Columns, int]:
+    """
+    Read a CSV column-wise: ({header: cells}, data row count).
+    """
+    with path.open("r", newline="", encoding="utf-8") as fh:
+        reader = csv.reader(fh)
+        headers = next(reader, [])
+        width = len(headers)
+        pad = [""] * width
+        rows = [
+            row if len(row) == width else (row + pad)[:width]
+            for row in reader
+            if row
+        ]
+    # zip(*rows) transposes in C; a repeated header keeps its last column, as DictReader did.
+    columns: Columns = dict(zip(headers, zip(*rows))) if rows else {name: () for name in headers}
+    return headers, columns, len(rows)
+
+
+def _column(columns: Columns, key: str, row_count: int) -> Sequence[str]:
+    return columns.get(key) or ("",) * row_count
+
+
+def _cell(columns: Columns, key: str, idx: int) -> str:
+    column = columns.get(key)
+    return column[idx] if column else ""
+
+
+def _ticker_column(columns: Columns, row_count: int) -> List[str]:
+    """
+    First non-blank ticker per row across _TICKER_KEYS; "" when none is set.
+    """
+    present = [columns[key] for key in _TICKER_KEYS if key in columns]
+    if not present:
+        return [""] * row_count
+    # Strip each source column once with a C-level map, then fall back across
+    # columns only when more than one ticker header exists.
+    tickers = list(map(str.strip, present[0]))
+    for cells in present[1:]:
+        tickers = [
+            ticker or fallback
+            for ticker, fallback in zip(tickers, map(str.strip, cells))
+        ]
+    return tickers
+
+
+class SignalRow(NamedTuple):
+    """
+    One emitted signal; field order is the signal CSV column order.
+    """
+
+    ticker: str
+    fair_yes_probability: float
+    confidence: float
+    score: float
+    edge_magnitude: float
+    side_bias: str
+    recommended_stake_usd: float
+    source: str
+    model_version: Optional[str]
+    horizon_minutes: Optional[int]
+    expected_edge_net: Optional[float]
+
+
+def _signal_record(
+    columns: Columns,
+    idx: int,
+    ticker: str,
+    fair_yes_probability: float,
+    confidence: float,
+    score: float,
+    bankroll: float,
+) -> SignalRow:
+    source_hint = _cell(columns, "source", idx).strip()
+    strategy_hint = _cell(columns, "strategy", idx).strip()
+    symbol_hint = _cell(columns, "symbol", idx).strip()
+    label = strategy_hint or symbol_hint or source_hint or "openclaw-model"
+    model_version = _cell(columns, "model_version", idx).strip() or None
+    horizon_minutes = _safe_float(_cell(columns, "horizon_minutes", idx))
+    expected_edge_net = _prob_from_raw(_cell(columns, "expected_edge_net", idx))
+
+    edge_magnitude = abs(fair_yes_probability - 0.5)
+    side = "YES" if fair_yes_probability >= 0.5 else "NO"
+    stake_fraction = _clamp(edge_magnitude * confidence * 2.4, 0.01, 0.25)
+    recommended_stake_usd = round(bankroll * stake_fraction, 2)
+
+    return SignalRow(
+        ticker,
+        round(fair_yes_probability, 6),
+        round(confidence, 6),
+        score,
+        round(edge_magnitude, 6),
+        side,
+        recommended_stake_usd,
+        f"rarecandy:{label}",
+        model_version,
+        int(horizon_minutes) if horizon_minutes is not None else None,
+        expected_edge_net,
+    )
 
 
 def _build_signals(
-    rows: Sequence[Dict[str, str]],
+    columns: Columns,
+    row_count: int,
     top_k: int,
     bankroll: float,
-) -> List[Dict[str, Any]]:
-    built: List[Dict[str, Any]] = []
+) -> List[SignalRow]:
     skipped_missing = 0
     skipped_invalid = 0
 
-    for row in rows:
-        ticker = _ticker_for_row(row)
-        direct_prob = _direct_probability(row)
-        direct_conf = _direct_confidence(row)
+    # Column pass: ticker, probability and confidence alone decide eligibility
+    # and ranking, so the remaining fields are only parsed for emitted rows.
+    tickers = _ticker_column(columns, row_count)
+    probabilities = _prob_column(_column(columns, "fair_yes_probability", row_count))
+    confidences = _prob_column(_column(columns, "confidence", row_count))
+
+    # Keep only strongest signal per ticker: ticker -> (score, row index).
+    best: Dict[str, Tuple[float, int]] = {}
+    for idx, (ticker, probability, confidence) in enumerate(zip(tickers, probabilities, confidences)):
         if not ticker:
             skipped_missing += 1
             continue
-        if direct_prob is None or direct_conf is None:
+        if probability is None or confidence is None:
             skipped_missing += 1
             continue
         if not ticker.startswith("KX"):
             skipped_invalid += 1
             continue
-
-        source_hint = str(row.get("source", "")).strip()
-        strategy_hint = str(row.get("strategy", "")).strip()
-        symbol_hint = str(row.get("symbol", "")).strip()
-        label = strategy_hint or symbol_hint or source_hint or "openclaw-model"
-        model_version = str(row.get("model_version", "")).strip() or None
-        horizon_minutes = _safe_float(row.get("horizon_minutes"))
-        expected_edge_net = _prob_from_raw(row.get("expected_edge_net"))
-
-        fair_yes_probability = direct_prob
-        confidence = direct_conf
-        score = abs(fair_yes_probability - 0.5) * confidence
-
-        edge_magnitude = abs(fair_yes_probability - 0.5)
-        side = "YES" if fair_yes_probability >= 0.5 else "NO"
-        stake_fraction = _clamp(edge_magnitude * confidence * 2.4, 0.01, 0.25)
-        recommended_stake_usd = round(bankroll * stake_fraction, 2)
-
-        built.append(
-            {
-                "ticker": ticker,
-                "fair_yes_probability": round(fair_yes_probability, 6),
-                "confidence": round(confidence, 6),
-                "score": round(score, 6),
-                "edge_magnitude": round(edge_magnitude, 6),
-                "side_bias": side,
-                "recommended_stake_usd": recommended_stake_usd,
-                "source": f"rarecandy:{label}",
-                "model_version": model_version,
-                "horizon_minutes": int(horizon_minutes) if horizon_minutes is not None else None,
-                "expected_edge_net": expected_edge_net,
-            }
-        )
-
-    # Keep only strongest signal per ticker.
-    by_ticker: Dict[str, Dict[str, Any]] = {}
-    for signal in built:
-        existing = by_ticker.get(signal["ticker"])
-        if existing is None or signal["score"] > existing["score"]:
-            by_ticker[signal["ticker"]] = signal
-
-    ranked = sorted(by_ticker.values(), key=lambda x: x["score"], reverse=True)
+        score = round(abs(probability - 0.5) * confidence, 6)
+        existing = best.get(ticker)
+        if existing is None or score > existing[0]:
+            best[ticker] = (score, idx)
+
+    # top_k is small, so a bounded heap beats sorting every ticker; ties keep
+    # first-seen order either way.
+    score_key = itemgetter(0)
     if top_k > 0:
-        ranked = ranked[:top_k]
+        ranked = heapq.nlargest(top_k, best.values(), key=score_key)
+    else:
+        ranked = sorted(best.values(), key=score_key, reverse=True)
     if skipped_missing:
         print(f"Skipped {skipped_missing} row(s): missing ticker/fair_yes_probability/confidence.")
     if skipped_invalid:
         print(f"Skipped {skipped_invalid} row(s): non-Kalshi ticker format.")
-    return ranked
+    return [
+        _signal_record(columns, idx, tickers[idx], probabilities[idx], confidences[idx], score, bankroll)
+        for score, idx in ranked
+    ]
 
 
-def _write_signal_csv(path: Path, signals: Sequence[Dict[str, Any]]) -> None:
+def _write_signal_csv(path: Path, signals: Sequence[SignalRow]) -> None:
     path.parent.mkdir(parents=True, exist_ok=True)
-    fieldnames = [
-        "ticker",
-        "fair_yes_probability",
-        "confidence",
-        "score",
-        "edge_magnitude",
-        "side_bias",
-        "recommended_stake_usd",
-        "source",
-        "model_version",
-        "horizon_minutes",
-        "expected_edge_net",
-    ]
     with path.open("w", newline="", encoding="utf-8") as fh:
-        writer = csv.DictWriter(fh, fieldnames=fieldnames)
-        writer.writeheader()
-        for row in signals:
-            writer.writerow(row)
+        writer = csv.writer(fh)
+        writer.writerow(SignalRow._fields)
+        writer.writerows(signals)
 
 
-def _write_alpha_json(path: Path, signals: Sequence[Dict[str, Any]], input_path: Path) -> None:
+def _write_alpha_json(path: Path, signals: Sequence[SignalRow], input_path: Path) -> None:
+    # Positional construction in AlphaSignal field order skips per-record kwargs handling.
     normalized = {
-        row["ticker"]: AlphaSignal(
-            fair_yes_probability=float(row["fair_yes_probability"]),
-            confidence=float(row["confidence"]),
-            source=str(row["source"]),
-            model_version=row.get("model_version"),
-            horizon_minutes=row.get("horizon_minutes"),
-            expected_edge_net=row.get("expected_edge_net"),
+        row.ticker: AlphaSignal(
+            float(row.fair_yes_probability),
+            float(row.confidence),
+            str(row.source),
+            row.model_version,
+            row.horizon_minutes,
+            row.expected_edge_net,
         )
         for row in signals
     }
     write_alpha_signals(path, normalized, metadata={"input_file": str(input_path)})
 
 
-def _write_telegram(path: Path, signals: Sequence[Dict[str, Any]], bankroll: float) -> None:
+def _write_telegram(path: Path, signals: Sequence[SignalRow], bankroll: float) -> None:
     lines = []
     lines.append("📈 *Kalshi Signal Pack*")
     lines.append(f"Bankroll: ${bankroll:,.2f}")
@@ -195,15 +258,15 @@ def _write_telegram(path: Path, signals: Sequence[Dict[str, Any]], bankroll: flo
         lines.append("No eligible signals generated.")
     else:
         for idx, signal in enumerate(signals, start=1):
-            prob_pct = signal["fair_yes_probability"] * 100
-            conf_pct = signal["confidence"] * 100
-            edge_pct = signal["edge_magnitude"] * 100
+            prob_pct = signal.fair_yes_probability * 100
+            conf_pct = signal.confidence * 100
+            edge_pct = signal.edge_magnitude * 100
             lines.append(
-                f"{idx}. `{signal['ticker']}` | bias {signal['side_bias']} | "
+                f"{idx}. `{signal.ticker}` | bias {signal.side_bias} | "
                 f"p_yes {prob_pct:.1f}% | conf {conf_pct:.0f}% | edge {edge_pct:.1f}%"
             )
             lines.append(
-                f"   stake ${signal['recommended_stake_usd']:.2f} | src {signal['source']}"
+                f"   stake ${signal.recommended_stake_usd:.2f} | src {signal.source}"
             )
     path.parent.mkdir(parents=True, exist_ok=True)
     path.write_text("\n".join(lines) + "\n", encoding="utf-8")
@@ -234,8 +297,8 @@ def main() -> None:
     if not input_path.exists():
         raise SystemExit(f"Input CSV not found: {input_path}")
 
-    headers, rows = _read_csv(input_path)
-    if not rows:
+    headers, columns, row_count = _read_csv(input_path)
+    if not row_count:
         raise SystemExit("Input CSV has no rows.")
     lower_headers = {h.strip().lower() for h in headers}
     required = {"fair_yes_probability", "confidence"}
@@ -245,7 +308,7 @@ def main() -> None:
     if missing_required:
         raise SystemExit(f"Input CSV missing required column(s): {', '.join(missing_required)}")
 
-    signals = _build_signals(rows=rows, top_k=args.top_k, bankroll=args.bankroll)
+    signals = _build_signals(columns, row_count, top_k=args.top_k, bankroll=args.bankroll)
     if not signals:
         raise SystemExit(
             "No signals generated. Provide rows with valid Kalshi ticker + fair_yes_probability + confidence."
@@ -10,19 +10,24 @@ Signals are market-level "smart money flow follower" estimates:
 from __future__ import annotations
 
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 import csv
+import heapq
 from datetime import datetime, timezone
 import math
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from functools import partial
+from operator import itemgetter, mul
+from typing import Any, Dict, List, Optional, Tuple
 
 import sys
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from core.client import KalshiClient
+from core.client import KalshiClient, configure_cli_logging
 from core.trading import (
     AlphaSignal,
+    MarketBook,
     MarketQuote,
     apply_probability_calibration,
     load_probability_calibration,
@@ -80,6 +85,58 @@ def orderbook_imbalance(orderbook: Optional[Dict[str, List[Dict[str, float]]]],
     return (yes_qty - no_qty) / total
 
 
+DEFAULT_WORKERS = 8
+
+# Trades without a parseable time sort first, as datetime.min did.
+_NO_TIME = float("-inf")
+
+
+def _trade_time(trade: Dict[str, Any]) -> float:
+    # Float epoch keys compare far faster than aware datetimes during the sort;
+    # parse_timestamp already caches the trade times that recur on every poll.
+    dt = parse_timestamp(trade.get("created_time"))
+    return dt.timestamp() if dt else _NO_TIME
+
+
+def _mean_present(values: List[Optional[float]]) -> Optional[float]:
+    present = [value for value in values if value is not None]
+    return sum(present) / len(present) if present else None
+
+
+def _flow_aggregates(
+    quantities: List[float],
+    yes_prices: List[Optional[float]],
+    signs: List[int],
+) -> Tuple[float, float, float]:
+    """
+    Flow kernel over time-ordered trade columns.
+
+    Returns (signed_pressure, volume_accel, price_momentum); recent/prior windows
+    are the last `window` trades and the `window` before them.
+    """
+    n = len(quantities)
+    window = max(3, n // 3)
+    split = max(0, n - window)
+    prior_start = max(0, n - 2 * window)
+
+    total_qty = sum(quantities)
+    signed_qty = sum(map(mul, signs, quantities))
+    signed_pressure = (signed_qty / total_qty) if total_qty > 0 else 0.0
+
+    recent_qty = sum(quantities[split:])
+    prior_qty = sum(quantities[prior_start:split])
+    volume_accel = ((recent_qty - prior_qty) / prior_qty) if prior_qty > 0 else 0.0
+
+    recent_price = _mean_present(yes_prices[split:])
+    prior_price = _mean_present(yes_prices[prior_start:split])
+    if prior_price is None and prior_start:
+        prior_price = _mean_present(yes_prices[:split])
+    price_momentum = 0.0
+    if recent_price is not None and prior_price is not None:
+        price_momentum = recent_price - prior_price
+    return signed_pressure, volume_accel, price_momentum
+
+
 def compute_trade_features(trades: List[Dict[str, Any]]) -> Dict[str, float]:
     if not trades:
         return {
@@ -89,36 +146,22 @@ def compute_trade_features(trades: List[Dict[str, Any]]) -> Dict[str, float]:
             "price_momentum": 0.0,
         }
 
-    indexed = []
-    for trade in trades:
-        dt = parse_timestamp(trade.get("created_time")) or datetime.min.replace(tzinfo=timezone.utc)
-        indexed.append((dt, trade))
-    indexed.sort(key=lambda x: x[0])
-    ordered = [trade for _, trade in indexed]
+    ordered = sorted(trades, key=_trade_time)
 
-    quantities = [max(0.0, safe_float(t.get("count"))) for t in ordered]
-    yes_prices = [trade_yes_probability(t) for t in ordered]
-    signs = [parse_side_signal(t.get("side")) for t in ordered]
+    # One pass over the ordered tape fills all three columns.
+    quantities: List[float] = []
+    yes_prices: List[Optional[float]] = []
+    signs: List[int] = []
+    for trade in ordered:
+        get = trade.get
+        quantities.append(max(0.0, safe_float(get("count"))))
+        yes_prices.append(trade_yes_probability(trade))
+        signs.append(parse_side_signal(get("side")))
 
-    total_qty = sum(quantities)
-    signed_qty = sum(sign * qty for sign, qty in zip(signs, quantities))
-    signed_pressure = (signed_qty / total_qty) if total_qty > 0 else 0.0
-
-    window = max(3, len(ordered) // 3)
-    recent_qty = sum(quantities[-window:])
-    prior_qty = sum(quantities[-2 * window : -window]) if len(ordered) >= 2 * window else sum(quantities[:-window])
-    volume_accel = ((recent_qty - prior_qty) / prior_qty) if prior_qty > 0 else 0.0
-
-    recent_prices = [p for p in yes_prices[-window:] if p is not None]
-    prior_prices = [p for p in yes_prices[-2 * window : -window] if p is not None]
-    if not prior_prices:
-        prior_prices = [p for p in yes_prices[:-window] if p is not None]
-    price_momentum = 0.0
-    if recent_prices and prior_prices:
-        price_momentum = (sum(recent_prices) / len(recent_prices)) - (sum(prior_prices) / len(prior_prices))
+    signed_pressure, volume_accel, price_momentum = _flow_aggregates(quantities, yes_prices, signs)
 
     return {
-        "trade_count": float(len(ordered)),
+        "trade_count": float(len(trades)),
         "signed_pressure": signed_pressure,
         "volume_accel": volume_accel,
         "price_momentum": price_momentum,
@@ -140,22 +183,21 @@ def score_market(
     else:
         mid = 0.5
 
-    signed_pressure = trade_features["signed_pressure"]
-    volume_accel = math.tanh(trade_features["volume_accel"])
-    price_momentum = math.tanh(trade_features["price_momentum"] * 10.0)
-
-    flow_score = (
-        0.42 * signed_pressure
-        + 0.25 * imbalance
-        + 0.20 * volume_accel
-        + 0.13 * price_momentum
+    flow_score = max(
+        -1.0,
+        min(
+            1.0,
+            0.42 * trade_features["signed_pressure"]
+            + 0.25 * imbalance
+            + 0.20 * math.tanh(trade_features["volume_accel"])
+            + 0.13 * math.tanh(trade_features["price_momentum"] * 10.0),
+        ),
     )
-    flow_score = max(-1.0, min(1.0, flow_score))
-
-    fair_yes = clamp(mid + (flow_score * 0.18), 0.02, 0.98)
-    base_conf = 0.45 + 0.30 * abs(flow_score)
+    fair_yes = max(0.02, min(0.98, mid + flow_score * 0.18))
+    # 0.45 + 0.30*|flow| + a non-negative trade term never drops below the old
+    # 0.05 floor, so only the 0.99 cap can bind.
     trade_conf = min(0.25, trade_features["trade_count"] / 250.0)
-    confidence = clamp(base_conf + trade_conf, 0.05, 0.99)
+    confidence = min(0.99, 0.45 + 0.30 * abs(flow_score) + trade_conf)
 
     return {
         "mid_probability": mid,
@@ -165,6 +207,55 @@ def score_market(
     }
 
 
+def _process_quote(
+    client: KalshiClient,
+    quote: MarketQuote,
+    spread: float,
+    args: argparse.Namespace,
+    calibration_bins: List[Tuple[float, float]],
+) -> Optional[Dict[str, Any]]:
+    trades = client.get_market_trades(quote.ticker, limit=args.trade_limit)
+    trade_features = compute_trade_features(trades)
+    if trade_features["trade_count"] < args.min_trades:
+        return None
+
+    book = client.get_public_orderbook(quote.ticker)
+    imbalance = orderbook_imbalance(book, depth=args.book_depth)
+    scored = score_market(quote, trade_features, imbalance)
+    if scored["confidence"] < args.min_confidence:
+        return None
+
+    raw_fair = float(scored["fair_yes_probability"])
+    calibrated_fair = (
+        apply_probability_calibration(raw_fair, calibration_bins)
+        if calibration_bins
+        else raw_fair
+    )
+    edge = abs(calibrated_fair - scored["mid_probability"])
+    return {
+        "ticker": quote.ticker,
+        "title": quote.title,
+        "volume": quote.volume,
+        "spread": spread,
+        "trade_count": int(trade_features["trade_count"]),
+        "signed_pressure": trade_features["signed_pressure"],
+        "volume_accel": trade_features["volume_accel"],
+        "price_momentum": trade_features["price_momentum"],
+        "orderbook_imbalance": imbalance,
+        "flow_score": scored["flow_score"],
+        "mid_probability": scored["mid_probability"],
+        "raw_fair_yes_probability": raw_fair,
+        "fair_yes_probability": calibrated_fair,
+        "confidence": scored["confidence"],
+        "edge_magnitude": edge,
+        "source": args.source_tag,
+    }
+
+
+def _rank_score(row: Dict[str, Any]) -> float:
+    return row["edge_magnitude"] * row["confidence"]
+
+
 def build_signals(args: argparse.Namespace) -> List[Dict[str, Any]]:
     client = KalshiClient(env=args.env)
     calibration_bins = (
@@ -173,63 +264,25 @@ def build_signals(args: argparse.Namespace) -> List[Dict[str, Any]]:
         else []
     )
     markets = client.get_markets(status="open", limit=args.markets_limit)
-    quotes: List[MarketQuote] = []
-    for market in markets:
-        quote = MarketQuote.from_market(market)
-        if quote:
-            quotes.append(quote)
-
-    candidates: List[Dict[str, Any]] = []
-    for quote in quotes:
-        if quote.volume < args.min_market_volume:
-            continue
-        spread = quote.spread("yes")
-        if spread is None or spread > args.max_spread:
-            continue
-
-        trades = client.get_market_trades(quote.ticker, limit=args.trade_limit)
-        trade_features = compute_trade_features(trades)
-        if trade_features["trade_count"] < args.min_trades:
-            continue
-
-        book = client.get_public_orderbook(quote.ticker)
-        imbalance = orderbook_imbalance(book, depth=args.book_depth)
-        scored = score_market(quote, trade_features, imbalance)
-        if scored["confidence"] < args.min_confidence:
-            continue
-
-        raw_fair = float(scored["fair_yes_probability"])
-        calibrated_fair = (
-            apply_probability_calibration(raw_fair, calibration_bins)
-            if calibration_bins
-            else raw_fair
-        )
-        edge = abs(calibrated_fair - scored["mid_probability"])
-        candidates.append(
-            {
-                "ticker": quote.ticker,
-                "title": quote.title,
-                "volume": quote.volume,
-                "spread": spread,
-                "trade_count": int(trade_features["trade_count"]),
-                "signed_pressure": trade_features["signed_pressure"],
-                "volume_accel": trade_features["volume_accel"],
-                "price_momentum": trade_features["price_momentum"],
-                "orderbook_imbalance": imbalance,
-                "flow_score": scored["flow_score"],
-                "mid_probability": scored["mid_probability"],
-                "raw_fair_yes_probability": raw_fair,
-                "fair_yes_probability": calibrated_fair,
-                "confidence": scored["confidence"],
-                "edge_magnitude": edge,
-                "source": args.source_tag,
-            }
-        )
-
-    candidates.sort(key=lambda row: row["edge_magnitude"] * row["confidence"], reverse=True)
-    if args.top_k > 0:
-        candidates = candidates[: args.top_k]
-    return candidates
+    market_book = MarketBook.from_quotes(MarketQuote.from_markets(markets))
+    # Cheap column filters first, so only liquid, tight markets hit the trade/book endpoints.
+    eligible = [
+        (quote, spread)
+        for quote, volume, spread in zip(market_book.quotes, market_book.volume, market_book.spreads("yes"))
+        if volume >= args.min_market_volume and spread is not None and spread <= args.max_spread
+    ]
+
+    # Each market costs two HTTP round trips; overlap them across a bounded pool.
+    workers = max(1, int(getattr(args, "workers", DEFAULT_WORKERS)))
+    process = partial(_process_quote, client, args=args, calibration_bins=calibration_bins)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        results = pool.map(process, [quote for quote, _ in eligible], [spread for _, spread in eligible])
+        # Rejected markets come back as None; top_k is small, so stream the
+        # survivors through a bounded heap rather than sorting them all.
+        candidates = filter(None, results)
+        if args.top_k > 0:
+            return heapq.nlargest(args.top_k, candidates, key=_rank_score)
+        return sorted(candidates, key=_rank_score, reverse=True)
 
 
 def write_outputs(
@@ -240,14 +293,16 @@ def write_outputs(
     model_version: str,
     horizon_minutes: int,
 ) -> None:
+    generated_at = datetime.now(timezone.utc).isoformat()
     normalized = {
         signal["ticker"]: AlphaSignal(
-            fair_yes_probability=float(signal["fair_yes_probability"]),
-            confidence=float(signal["confidence"]),
-            source=source_tag,
-            model_version=model_version,
-            horizon_minutes=horizon_minutes,
-            generated_at=datetime.now(timezone.utc).isoformat(),
+            float(signal["fair_yes_probability"]),
+            float(signal["confidence"]),
+            source_tag,
+            model_version,
+            horizon_minutes,
+            None,
+            generated_at,
         )
         for signal in signals
     }
@@ -274,10 +329,9 @@ def write_outputs(
             "source",
         ]
         with csv_out.open("w", newline="", encoding="utf-8") as fh:
-            writer = csv.DictWriter(fh, fieldnames=fieldnames)
-            writer.writeheader()
-            for row in signals:
-                writer.writerow(row)
+            writer = csv.writer(fh)
+            writer.writerow(fieldnames)
+            writer.writerows(map(itemgetter(*fieldnames), signals))
 
 
 def parse_args() -> argparse.Namespace:
@@ -295,6 +349,12 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--model-version", default="smart_money_flow_v1")
     parser.add_argument("--horizon-minutes", type=int, default=60)
     parser.add_argument("--calibration", help="Optional alpha calibration JSON file")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help="Concurrent per-market trade/orderbook fetches",
+    )
     parser.add_argument("--alpha-out", default="data/alpha_signals.json")
     parser.add_argument("--csv-out", default="data/flow_signals_latest.csv")
     return parser.parse_args()
@@ -322,4 +382,5 @@ def main() -> None:
 
 
 if __name__ == "__main__":
+    configure_cli_logging()
     main()
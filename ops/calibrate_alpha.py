@@ -9,24 +9,25 @@ from __future__ import annotations
 
 import argparse
 from datetime import datetime, timezone
-import json
+from itertools import accumulate
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import sys
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from core import jsonio
 from core.trading import (
     AlphaSignal,
-    apply_probability_calibration,
+    apply_probability_calibration_batch,
     load_alpha_signals,
     to_probability,
     write_alpha_signals,
 )
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Calibrate fair probabilities from replay outcomes")
     parser.add_argument("--replay-results", required=True, help="Output JSON from sweep_replay_params.py")
     parser.add_argument("--out", default="data/alpha_calibration.json")
@@ -35,11 +36,11 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--min-points-per-bin", type=int, default=5)
     parser.add_argument("--alpha-in", help="Optional alpha_signals.json to calibrate")
     parser.add_argument("--alpha-out", help="Output path for calibrated alpha_signals.json")
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 
 def _load_json(path: Path) -> Dict[str, Any]:
-    return json.loads(path.read_text())
+    return jsonio.loads(path.read_bytes())
 
 
 def _find_run(payload: Dict[str, Any], run_id: Optional[int]) -> Dict[str, Any]:
@@ -55,7 +56,10 @@ def _find_run(payload: Dict[str, Any], run_id: Optional[int]) -> Dict[str, Any]:
     raise SystemExit(f"Run id {run_id} not found in top_runs.")
 
 
-def _trade_points_from_state(state_path: Path) -> List[Dict[str, float]]:
+def _trade_points_from_state(state_path: Path) -> Tuple[List[float], List[float]]:
+    """
+    (predicted win probabilities, 0/1 outcomes) as parallel columns, one entry per usable closed trade.
+    """
     if not state_path.exists():
         raise SystemExit(f"Holdout state file not found: {state_path}")
     payload = _load_json(state_path)
@@ -63,81 +67,98 @@ def _trade_points_from_state(state_path: Path) -> List[Dict[str, float]]:
     if not isinstance(closed, list):
         closed = []
 
-    points: List[Dict[str, float]] = []
+    predicted: List[float] = []
+    outcomes: List[float] = []
+    add_predicted = predicted.append
+    add_outcome = outcomes.append
     for trade in closed:
         if not isinstance(trade, dict):
             continue
-        pred = to_probability(trade.get("entry_win_probability"))
+        get = trade.get
+        pred = to_probability(get("entry_win_probability"))
         if pred is None:
-            fair_yes = to_probability(trade.get("entry_fair_yes_probability"))
-            side = str(trade.get("side", "")).lower().strip()
+            fair_yes = to_probability(get("entry_fair_yes_probability"))
+            side = str(get("side", "")).lower().strip()
             if fair_yes is None or side not in {"yes", "no"}:
                 continue
             pred = fair_yes if side == "yes" else (1.0 - fair_yes)
-        pnl = float(trade.get("pnl_cents", trade.get("pnl", 0.0)) or 0.0)
-        outcome = 1.0 if pnl > 0 else 0.0
-        points.append(
-            {
-                "predicted_probability": float(pred),
-                "outcome": outcome,
-            }
-        )
-    return points
+        pnl = float(get("pnl_cents", get("pnl", 0.0)) or 0.0)
+        add_predicted(float(pred))
+        add_outcome(1.0 if pnl > 0 else 0.0)
+    return predicted, outcomes
 
 
 def _enforce_monotonic(rows: List[Dict[str, float]]) -> List[Dict[str, float]]:
     if not rows:
         return rows
-    adjusted: List[Dict[str, float]] = []
-    running = 0.0
-    for idx, row in enumerate(rows):
-        value = float(row["calibrated_probability"])
-        if idx == 0:
-            running = value
-        else:
-            running = max(running, value)
-        adjusted.append(
-            {
-                "raw_probability": float(row["raw_probability"]),
-                "calibrated_probability": float(min(1.0, running)),
-                "count": int(row["count"]),
-                "observed_win_rate": float(row["observed_win_rate"]),
-            }
-        )
-    return adjusted
+    running_max = accumulate((float(row["calibrated_probability"]) for row in rows), max)
+    return [
+        {
+            "raw_probability": float(row["raw_probability"]),
+            "calibrated_probability": float(min(1.0, running)),
+            "count": int(row["count"]),
+            "observed_win_rate": float(row["observed_win_rate"]),
+        }
+        for row, running in zip(rows, running_max)
+    ]
+
+
+def _bin_index(probability: float, bins: int) -> int:
+    """
+    Bin holding probability under the [idx/bins, (idx+1)/bins) edges; 1.0 joins the last bin.
+    """
+    if probability >= 1.0:
+        return bins - 1
+    idx = min(bins - 1, max(0, int(probability * bins)))
+    # Nudge for float rounding in probability * bins so edges match idx / bins exactly.
+    while idx > 0 and probability < idx / bins:
+        idx -= 1
+    while idx < bins - 1 and probability >= (idx + 1) / bins:
+        idx += 1
+    return idx
 
 
 def _fit_bins(
-    points: List[Dict[str, float]],
+    predicted_probabilities: List[float],
+    outcome_values: List[float],
     bins: int,
     min_points_per_bin: int,
 ) -> List[Dict[str, float]]:
     bins = max(2, int(bins))
-    if not points:
+    if not predicted_probabilities:
         raise SystemExit("No calibration points found in holdout state.")
 
+    # Single pass: route each point to its bin instead of rescanning all points per bin.
+    predicted: List[List[float]] = [[] for _ in range(bins)]
+    outcomes: List[List[float]] = [[] for _ in range(bins)]
+    ones_predicted: List[float] = []
+    ones_outcomes: List[float] = []
+    for probability, outcome in zip(predicted_probabilities, outcome_values):
+        if probability == 1.0:
+            # Kept apart so the last bin sums in the same order as before.
+            ones_predicted.append(probability)
+            ones_outcomes.append(outcome)
+            continue
+        if not 0.0 <= probability < 1.0:
+            continue
+        idx = _bin_index(probability, bins)
+        predicted[idx].append(probability)
+        outcomes[idx].append(outcome)
+    predicted[-1].extend(ones_predicted)
+    outcomes[-1].extend(ones_outcomes)
+
     rows: List[Dict[str, float]] = []
-    for idx in range(bins):
-        lo = idx / bins
-        hi = (idx + 1) / bins
-        bucket = [
-            point
-            for point in points
-            if (point["predicted_probability"] >= lo and point["predicted_probability"] < hi)
-        ]
-        if idx == bins - 1:
-            bucket.extend(
-                [point for point in points if point["predicted_probability"] == 1.0]
-            )
-        if len(bucket) < min_points_per_bin:
+    for bucket_predicted, bucket_outcomes in zip(predicted, outcomes):
+        count = len(bucket_predicted)
+        if count < min_points_per_bin:
             continue
-        raw_mean = sum(p["predicted_probability"] for p in bucket) / len(bucket)
-        win_rate = sum(p["outcome"] for p in bucket) / len(bucket)
+        raw_mean = sum(bucket_predicted) / count
+        win_rate = sum(bucket_outcomes) / count
         rows.append(
             {
                 "raw_probability": raw_mean,
                 "calibrated_probability": win_rate,
-                "count": len(bucket),
+                "count": count,
                 "observed_win_rate": win_rate,
             }
         )
@@ -164,10 +185,13 @@ def _apply_calibration_to_alpha(
         (float(row["raw_probability"]), float(row["calibrated_probability"]))
         for row in bins
     ]
-    calibrated: Dict[str, AlphaSignal] = {}
-    for ticker, signal in signals.items():
-        cal_prob = apply_probability_calibration(signal.fair_yes_probability, mapping)
-        calibrated[ticker] = AlphaSignal(
+    # One batch call prepares the calibration knots once for every signal.
+    cal_probs = apply_probability_calibration_batch(
+        [signal.fair_yes_probability for signal in signals.values()],
+        mapping,
+    )
+    calibrated: Dict[str, AlphaSignal] = {
+        ticker: AlphaSignal(
             fair_yes_probability=cal_prob,
             confidence=signal.confidence,
             source=signal.source,
@@ -176,6 +200,8 @@ def _apply_calibration_to_alpha(
             expected_edge_net=signal.expected_edge_net,
             generated_at=signal.generated_at,
         )
+        for (ticker, signal), cal_prob in zip(signals.items(), cal_probs)
+    }
     write_alpha_signals(
         alpha_out,
         calibrated,
@@ -187,8 +213,8 @@ def _apply_calibration_to_alpha(
     return len(calibrated)
 
 
-def main() -> None:
-    args = parse_args()
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
     replay_results_path = Path(args.replay_results)
     if not replay_results_path.exists():
         raise SystemExit(f"Replay results not found: {replay_results_path}")
@@ -199,9 +225,10 @@ def main() -> None:
     if not holdout_state_raw:
         raise SystemExit("Selected run missing holdout.state_file.")
 
-    points = _trade_points_from_state(Path(str(holdout_state_raw)))
+    predicted, outcomes = _trade_points_from_state(Path(str(holdout_state_raw)))
     bins = _fit_bins(
-        points=points,
+        predicted_probabilities=predicted,
+        outcome_values=outcomes,
         bins=int(args.bins),
         min_points_per_bin=int(args.min_points_per_bin),
     )
@@ -210,14 +237,14 @@ def main() -> None:
         "generated_at": datetime.now(timezone.utc).isoformat(),
         "replay_results": str(replay_results_path),
         "run_id": int(run.get("run_id", 0)),
-        "points_used": len(points),
+        "points_used": len(predicted),
         "bins": bins,
     }
     out_path = Path(args.out)
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(json.dumps(calibration_payload, indent=2))
+    out_path.write_bytes(jsonio.dumps(calibration_payload, indent=True))
     print(f"Calibration file written: {out_path}")
-    print(f"Bins: {len(bins)} | points: {len(points)}")
+    print(f"Bins: {len(bins)} | points: {len(predicted)}")
 
     if args.alpha_in or args.alpha_out:
         if not args.alpha_in or not args.alpha_out:
@@ -5,20 +5,25 @@ Capture deterministic replay snapshots from public markets/trades/orderbooks.
 from __future__ import annotations
 
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
-import json
+import heapq
+from operator import itemgetter
 from pathlib import Path
 import time
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Sequence
 
 import sys
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from core.client import KalshiClient
+from core import jsonio
+from core.client import KalshiClient, configure_cli_logging
 
+DEFAULT_WORKERS = 8
 
-def parse_args() -> argparse.Namespace:
+
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Capture /markets/trades snapshots for replay")
     parser.add_argument("--env", default="prod", choices=["demo", "prod"])
     parser.add_argument("--cycles", type=int, default=30)
@@ -27,8 +32,14 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--top-markets", type=int, default=30)
     parser.add_argument("--min-volume", type=float, default=2500.0)
     parser.add_argument("--trade-limit", type=int, default=120)
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help="Concurrent per-market trade/orderbook fetches",
+    )
     parser.add_argument("--out", default="data/trades_snapshots.jsonl")
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 
 def compact_market(market: Dict[str, Any]) -> Dict[str, Any]:
@@ -45,46 +56,72 @@ def compact_market(market: Dict[str, Any]) -> Dict[str, Any]:
     }
 
 
-def main() -> None:
-    args = parse_args()
+def capture_snapshot(client: KalshiClient, args: argparse.Namespace, sequence: int) -> Dict[str, Any]:
+    # Parse each volume once and rank on the cached float; only the top_markets
+    # most liquid are captured, so a bounded heap avoids sorting the rest.
+    volumes = [
+        (float(m.get("volume", 0) or 0), m)
+        for m in client.get_markets(status="open", limit=args.markets_limit)
+    ]
+    liquid = [pair for pair in volumes if pair[0] >= args.min_volume]
+    markets = [m for _, m in heapq.nlargest(args.top_markets, liquid, key=itemgetter(0))]
+
+    snapshot_markets: List[Dict[str, Any]] = []
+    books_by_ticker: Dict[str, Dict[str, Any]] = {}
+
+    tickers: List[str] = []
+    for market in markets:
+        ticker = str(market.get("ticker", "")).strip()
+        if not ticker:
+            continue
+        snapshot_markets.append(compact_market(market))
+        tickers.append(ticker)
+
+    # Orderbook and trade fetches share one bounded pool, so at most `workers`
+    # requests are in flight across both.
+    workers = max(1, int(getattr(args, "workers", DEFAULT_WORKERS)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        books = pool.map(client.get_public_orderbook, tickers)
+        trades_by_ticker = client.get_market_trades_bulk(tickers, limit=args.trade_limit, executor=pool)
+        for ticker, book in zip(tickers, books):
+            books_by_ticker[ticker] = book or {"yes_bids": [], "no_bids": []}
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "sequence": sequence,
+        "markets": snapshot_markets,
+        "trades": trades_by_ticker,
+        "orderbooks": books_by_ticker,
+    }
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
     client = KalshiClient(env=args.env)
     out_path = Path(args.out)
     out_path.parent.mkdir(parents=True, exist_ok=True)
 
-    for idx in range(args.cycles):
-        markets = client.get_markets(status="open", limit=args.markets_limit)
-        markets = [m for m in markets if float(m.get("volume", 0) or 0) >= args.min_volume]
-        markets.sort(key=lambda m: float(m.get("volume", 0) or 0), reverse=True)
-        markets = markets[: args.top_markets]
-
-        snapshot_markets: List[Dict[str, Any]] = []
-        trades_by_ticker: Dict[str, List[Dict[str, Any]]] = {}
-        books_by_ticker: Dict[str, Dict[str, Any]] = {}
-
-        for market in markets:
-            ticker = str(market.get("ticker", "")).strip()
-            if not ticker:
-                continue
-            snapshot_markets.append(compact_market(market))
-            trades_by_ticker[ticker] = client.get_market_trades(ticker=ticker, limit=args.trade_limit)
-            books_by_ticker[ticker] = client.get_public_orderbook(ticker) or {"yes_bids": [], "no_bids": []}
-
-        snapshot = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "sequence": idx + 1,
-            "markets": snapshot_markets,
-            "trades": trades_by_ticker,
-            "orderbooks": books_by_ticker,
-        }
-        with out_path.open("a", encoding="utf-8") as fh:
-            fh.write(json.dumps(snapshot) + "\n")
-        print(
-            f"Captured snapshot {idx + 1}/{args.cycles} | "
-            f"markets={len(snapshot_markets)} | out={out_path}"
-        )
-        if idx + 1 < args.cycles:
-            time.sleep(args.interval_seconds)
+    # One handle for the whole run instead of an open/close per cycle.
+    with out_path.open("ab") as fh:
+        # Cycles start on a fixed interval grid, so fetch time is not added on top of the sleep.
+        next_tick = time.monotonic()
+        for idx in range(args.cycles):
+            snapshot = capture_snapshot(client, args, idx + 1)
+            fh.write(jsonio.dumps_line(snapshot))
+            # Flush so each snapshot is on disk before the inter-cycle sleep.
+            fh.flush()
+            print(
+                f"Captured snapshot {idx + 1}/{args.cycles} | "
+                f"markets={len(snapshot['markets'])} | out={out_path}"
+            )
+            if idx + 1 < args.cycles:
+                now = time.monotonic()
+                # After an overrun, restart the grid from now instead of bursting to catch up.
+                next_tick = max(next_tick + args.interval_seconds, now)
+                if next_tick > now:
+                    time.sleep(next_tick - now)
 
 
 if __name__ == "__main__":
+    configure_cli_logging()
     main()
@@ -9,6 +9,7 @@ import sys
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from core import jsonio
 from ops.gate_metrics import evaluate_go_live_gates
 
 DEFAULT_FEE_PER_CONTRACT_PROB = 0.008
@@ -45,6 +46,12 @@ def parse_args() -> argparse.Namespace:
         default=0.25,
         help="Maximum allowed share [0,1] of absolute PnL from a single ticker",
     )
+    parser.add_argument(
+        "--fail-fast",
+        action="store_true",
+        help="Stop at a failing trades/expectancy/profit-factor/drawdown gate "
+        "without computing cost, concentration and holdout checks",
+    )
     parser.add_argument("--json-out", help="Optional JSON file for machine-readable gate output")
     return parser.parse_args()
 
@@ -80,7 +87,7 @@ def main() -> None:
     if not state_path.exists():
         raise SystemExit(f"State file not found: {state_path}")
 
-    payload = json.loads(state_path.read_text())
+    payload = jsonio.load_path(state_path)
     closed_positions = payload.get("closed_positions", [])
     if not isinstance(closed_positions, list):
         closed_positions = []
@@ -108,10 +115,11 @@ def main() -> None:
         max_concentration_share=float(args.max_concentration_share),
         fee_per_contract_prob=fee_per_contract_prob,
         slippage_spread_factor=slippage_spread_factor,
+        full_report=not args.fail_fast,
     )
 
-    print("Go-Live Gate Check")
-    print("-" * 72)
+    # Render the report into one buffer and write it once.
+    lines = ["Go-Live Gate Check", "-" * 72]
     for check in gate["checks"]:
         status = "PASS" if check["pass"] else "FAIL"
         name = check["name"]
@@ -131,16 +139,17 @@ def main() -> None:
                 expr = f"{value:.4f}% {direction} 0.0000%"
         else:
             expr = f"{value:.4f} {direction} {threshold:.4f}"
-        print(f"{status} | {name}: {expr}")
+        lines.append(f"{status} | {name}: {expr}")
 
     concentration = gate["concentration"]
     max_ticker = concentration.get("max_ticker")
     if max_ticker:
-        print(
+        lines.append(
             f"INFO | concentration leader: {max_ticker} "
             f"({float(concentration['max_share_of_abs_pnl']) * 100:.2f}% of abs PnL)"
         )
-    print("-" * 72)
+    lines.append("-" * 72)
+    sys.stdout.write("\n".join(lines) + "\n")
 
     if args.json_out:
         out_path = Path(args.json_out)
@@ -6,9 +6,10 @@ import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from core.client import KalshiClient
-import json
-from datetime import datetime
+from core import jsonio
+from core.client import KalshiClient, configure_cli_logging
+from collections import Counter
+import time
 
 
 def collect_markets():
@@ -24,39 +25,32 @@ def collect_markets():
     
     print(f"✅ Found {len(markets)} open markets")
     
-    # Group by category
-    by_category = {}
-    for market in markets:
-        cat = market.get("category", "unknown")
-        if cat not in by_category:
-            by_category[cat] = []
-        by_category[cat].append(market)
+    # Count by category; most_common() orders by count, ties in first-seen order
+    by_category = Counter(market.get("category", "unknown") for market in markets)
     
     print("\n📈 Markets by category:")
-    for cat, mkts in sorted(by_category.items(), key=lambda x: len(x[1]), reverse=True):
-        print(f"  {cat}: {len(mkts)} markets")
+    for cat, count in by_category.most_common():
+        print(f"  {cat}: {count} markets")
     
-    # Save to file
+    # Append one compact line per run to the history; the dataset grows without rewriting earlier runs
     os.makedirs("data", exist_ok=True)
-    timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-    filepath = f"data/markets_{timestamp}.json"
-    
-    with open(filepath, "w") as f:
-        json.dump({
-            "timestamp": timestamp,
-            "count": len(markets),
-            "markets": markets,
-        }, f, indent=2)
-    
-    print(f"\n💾 Saved to {filepath}")
-    
-    # Also save as "latest"
-    with open("data/markets_latest.json", "w") as f:
-        json.dump({
-            "timestamp": timestamp,
-            "count": len(markets),
-            "markets": markets,
-        }, f, indent=2)
+    timestamp = time.strftime("%Y%m%d_%H%M%S", time.gmtime())
+    line = jsonio.dumps_line({
+        "timestamp": timestamp,
+        "count": len(markets),
+        "markets": markets,
+    })
+    history_path = "data/markets.jsonl"
+    with open(history_path, "ab") as f:
+        f.write(line)
+    
+    print(f"\n💾 Appended to {history_path}")
+    
+    # Also publish the same bytes as "latest" via temp file + rename so readers never see a partial file
+    latest_tmp = "data/markets_latest.json.tmp"
+    with open(latest_tmp, "wb") as f:
+        f.write(line)
+    os.replace(latest_tmp, "data/markets_latest.json")
     
     print("✅ Data collection complete")
     
@@ -64,4 +58,5 @@ def collect_markets():
 
 
 if __name__ == "__main__":
+    configure_cli_logging()
     collect_markets()
@@ -13,23 +13,53 @@ from __future__ import annotations
 
 import argparse
 from datetime import datetime, timezone
+import os
 from pathlib import Path
 import subprocess
 import sys
 import time
-from typing import List
-import json
+import traceback
+from typing import Any, Callable, Dict, List, Optional, Sequence
 
+sys.path.insert(0, str(Path(__file__).parent.parent))
 
-def run_command(
-    cmd: List[str],
+from core import jsonio
+from core.client import configure_cli_logging
+from ops import calibrate_alpha, capture_trades_snapshots, run_quant_pipeline, sweep_replay_params
+
+
+def run_stage(
+    name: str,
+    stage_main: Callable[[Optional[Sequence[str]]], None],
+    argv: List[str],
     *,
     cwd: Path,
     check: bool = True,
 ) -> int:
-    print(f"$ {' '.join(cmd)}")
-    completed = subprocess.run(cmd, cwd=str(cwd), check=check)
-    return int(completed.returncode)
+    """
+    Run an ops script's main() in-process (no interpreter startup per stage)
+    and return the exit code it would have had as a child process.
+    """
+    print(f"$ {name} {' '.join(argv)}")
+    previous_cwd = os.getcwd()
+    os.chdir(cwd)
+    try:
+        stage_main(argv)
+        code = 0
+    except SystemExit as exc:
+        if exc.code is None or isinstance(exc.code, int):
+            code = int(exc.code or 0)
+        else:
+            print(exc.code, file=sys.stderr)
+            code = 1
+    except Exception:
+        traceback.print_exc()
+        code = 1
+    finally:
+        os.chdir(previous_cwd)
+    if check and code != 0:
+        raise SystemExit(f"Stage {name} failed with exit code {code}.")
+    return code
 
 
 def parse_args() -> argparse.Namespace:
@@ -62,21 +92,11 @@ def parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
-def _load_json(path: Path):
-    return json.loads(path.read_text())
-
-
 def _timestamp() -> str:
     return datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
 
 
-def _summary_line(gate_json: Path) -> str:
-    if not gate_json.exists():
-        return "gate_json_missing"
-    try:
-        payload = _load_json(gate_json)
-    except Exception:
-        return "gate_json_parse_error"
+def _summary_line(payload: Dict[str, Any]) -> str:
     go_live = bool(payload.get("go_live"))
     metrics = payload.get("metrics", {})
     trades = int(metrics.get("trades", 0) or 0)
@@ -117,10 +137,10 @@ def main() -> None:
 
         # 1) Capture snapshots (optional).
         if not args.skip_capture:
-            run_command(
+            run_stage(
+                "ops/capture_trades_snapshots.py",
+                capture_trades_snapshots.main,
                 [
-                    sys.executable,
-                    "ops/capture_trades_snapshots.py",
                     "--env",
                     args.env,
                     "--cycles",
@@ -147,10 +167,10 @@ def main() -> None:
 
         # 2) Sweep replay params.
         sweep_out = root / "data" / "replay_sweeps" / f"{stamp}_iter{iteration:04d}.json"
-        run_command(
+        run_stage(
+            "ops/sweep_replay_params.py",
+            sweep_replay_params.main,
             [
-                sys.executable,
-                "ops/sweep_replay_params.py",
                 "--snapshot-file",
                 str(snapshot_file),
                 "--out",
@@ -167,10 +187,10 @@ def main() -> None:
 
         # 3) Calibrate alpha.
         calibration_path = root / "data" / "alpha_calibration.json"
-        calib_rc = run_command(
+        calib_rc = run_stage(
+            "ops/calibrate_alpha.py",
+            calibrate_alpha.main,
             [
-                sys.executable,
-                "ops/calibrate_alpha.py",
                 "--replay-results",
                 str(sweep_out),
                 "--out",
@@ -188,9 +208,7 @@ def main() -> None:
         # 4) Run quant pipeline (paper + report).
         report_md = root / "data" / "quant_pm_report.md"
         report_json = root / "data" / "quant_pm_report.json"
-        pipeline_cmd = [
-            sys.executable,
-            "ops/run_quant_pipeline.py",
+        pipeline_argv = [
             "--alpha-source",
             args.alpha_source,
             "--top-k",
@@ -212,22 +230,34 @@ def main() -> None:
             "--emit-json-report",
         ]
         if calibration_available:
-            pipeline_cmd.extend(["--calibration-file", str(calibration_path)])
+            pipeline_argv.extend(["--calibration-file", str(calibration_path)])
         if args.alpha_source == "csv":
-            pipeline_cmd.extend(["--input", str(args.alpha_input)])
+            pipeline_argv.extend(["--input", str(args.alpha_input)])
 
-        pipeline_rc = run_command(pipeline_cmd, cwd=root, check=False)
+        pipeline_rc = run_stage(
+            "ops/run_quant_pipeline.py",
+            run_quant_pipeline.main,
+            pipeline_argv,
+            cwd=root,
+            check=False,
+        )
 
         gate_json = root / "data" / "go_live_gate.json"
-        summary = _summary_line(gate_json)
-        print(f"Iteration summary: {summary}")
-
-        go_live = False
-        if gate_json.exists():
+        # Parse the gate output once for both the summary and the pass check.
+        gate_payload: Optional[Dict[str, Any]] = None
+        if not gate_json.exists():
+            summary = "gate_json_missing"
+        else:
             try:
-                go_live = bool(_load_json(gate_json).get("go_live"))
+                parsed = jsonio.load_path(gate_json)
+                summary = _summary_line(parsed)
             except Exception:
-                go_live = False
+                summary = "gate_json_parse_error"
+            else:
+                gate_payload = parsed
+        print(f"Iteration summary: {summary}")
+
+        go_live = bool(gate_payload.get("go_live")) if gate_payload is not None else False
 
         if go_live and pipeline_rc == 0:
             consecutive_pass += 1
@@ -241,10 +271,8 @@ def main() -> None:
             if args.deploy_live_on_pass:
                 print("Deploying live trader because --deploy-live-on-pass was set...")
                 deploy = subprocess.run(
-                    ["bash", "deploy_auto_trader.sh", "live"],
+                    ["bash", "deploy_auto_trader.sh", "live", "--yes"],
                     cwd=str(root),
-                    text=True,
-                    input="yes\n",
                     check=False,
                 )
                 if deploy.returncode != 0:
@@ -265,4 +293,5 @@ def main() -> None:
 
 
 if __name__ == "__main__":
+    configure_cli_logging()
     main()
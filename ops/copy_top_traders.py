@@ -13,6 +13,7 @@ import sys
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
+from core.client import configure_cli_logging
 from ops.build_flow_alpha import build_signals, write_outputs
 
 
@@ -48,4 +49,5 @@ def main() -> None:
 
 
 if __name__ == "__main__":
+    configure_cli_logging()
     main()
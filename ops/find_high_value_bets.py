@@ -6,39 +6,53 @@ import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from core.client import KalshiClient
+from core import jsonio
+from core.client import KalshiClient, configure_cli_logging
 from core.analyzer import MarketAnalyzer
-import json
-from datetime import datetime
+from collections import defaultdict
+from pathlib import Path
+import time
+from typing import Dict, List, Optional
 
 
 def load_latest_markets():
     """Load most recent market data"""
     try:
-        with open("data/markets_latest.json", "r") as f:
-            data = json.load(f)
-            return data.get("markets", [])
+        data = jsonio.load_path(Path("data/markets_latest.json"))
+        return data.get("markets", [])
     except FileNotFoundError:
         print("❌ No market data found. Run: python3 ops/collect_markets.py")
         return []
 
 
-def find_opportunities(target_return: float = 5.0):
+def fetch_markets() -> List[Dict]:
+    """Fetch open markets from the API when there is no usable cache"""
+    client = KalshiClient()
+    return client.get_markets(status="open", limit=200)
+
+
+def find_opportunities(
+    target_return: float = 5.0,
+    markets: Optional[List[Dict]] = None,
+    analyzer: Optional[MarketAnalyzer] = None,
+):
     """
     Find betting opportunities
     
     Args:
         target_return: Desired return multiplier (e.g., 5.0 for 5x)
+        markets: Already-loaded markets; loaded from cache or the API when omitted
+        analyzer: Shared analyzer instance; a new one is created when omitted
     """
     print(f"🔍 Searching for {target_return}x opportunities...")
     
-    markets = load_latest_markets()
+    if markets is None:
+        markets = load_latest_markets()
     if not markets:
         print("📊 Fetching fresh market data...")
-        client = KalshiClient()
-        markets = client.get_markets(status="open", limit=200)
+        markets = fetch_markets()
     
-    analyzer = MarketAnalyzer()
+    analyzer = analyzer or MarketAnalyzer()
     
     # Find high-return bets (long shots with value)
     print(f"\n💰 High-Return Bets ({target_return}x+):")
@@ -73,39 +87,45 @@ def find_opportunities(target_return: float = 5.0):
     
     # Analyze by category for patterns
     print("📊 Category Analysis:")
-    by_category = {}
+    # Per category: [count, total_volume, price_sum, priced_count], accumulated in one pass
+    by_category = defaultdict(lambda: [0, 0, 0, 0])
     for market in markets:
-        cat = market.get("category", "unknown")
-        if cat not in by_category:
-            by_category[cat] = {"count": 0, "total_volume": 0, "avg_price": []}
-        
-        by_category[cat]["count"] += 1
-        by_category[cat]["total_volume"] += market.get("volume", 0)
-        if market.get("last_price"):
-            by_category[cat]["avg_price"].append(market["last_price"])
-    
-    for cat, stats in sorted(by_category.items(), key=lambda x: x[1]["total_volume"], reverse=True)[:5]:
-        avg_price = sum(stats["avg_price"]) / len(stats["avg_price"]) if stats["avg_price"] else 0
-        print(f"  {cat}: {stats['count']} markets, ${stats['total_volume']:,.0f} volume, {avg_price*100:.1f}¢ avg")
-    
-    # Save opportunities
+        stats = by_category[market.get("category", "unknown")]
+        stats[0] += 1
+        stats[1] += market.get("volume", 0)
+        last_price = market.get("last_price")
+        if last_price:
+            stats[2] += last_price
+            stats[3] += 1
+    
+    for cat, (count, total_volume, price_sum, priced) in sorted(by_category.items(), key=lambda x: x[1][1], reverse=True)[:5]:
+        avg_price = price_sum / priced if priced else 0
+        print(f"  {cat}: {count} markets, ${total_volume:,.0f} volume, {avg_price*100:.1f}¢ avg")
+    
+    # Save opportunities: one compact line per run, so the history is read back by
+    # streaming lines instead of globbing and parsing a file per run
     os.makedirs("data", exist_ok=True)
-    timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+    timestamp = time.strftime("%Y%m%d_%H%M%S", time.gmtime())
     
-    with open(f"data/opportunities_{timestamp}.json", "w") as f:
-        json.dump({
+    history_path = "data/opportunities.jsonl"
+    with open(history_path, "ab") as f:
+        f.write(jsonio.dumps_line({
             "timestamp": timestamp,
             "target_return": target_return,
             "high_return_bets": high_return[:20],
             "arbitrage": arbitrage,
-        }, f, indent=2)
+        }))
     
-    print(f"\n💾 Saved to data/opportunities_{timestamp}.json")
+    print(f"\n💾 Appended to {history_path}")
     
     return high_return
 
 
-def get_top_recommendation(target_return: float = 5.0):
+def get_top_recommendation(
+    target_return: float = 5.0,
+    markets: Optional[List[Dict]] = None,
+    analyzer: Optional[MarketAnalyzer] = None,
+):
     """
     Get the single best recommendation
     
@@ -114,12 +134,12 @@ def get_top_recommendation(target_return: float = 5.0):
     - Reasonable liquidity
     - Category with historical edge
     """
-    markets = load_latest_markets()
+    if markets is None:
+        markets = load_latest_markets()
     if not markets:
-        client = KalshiClient()
-        markets = client.get_markets(status="open", limit=200)
+        markets = fetch_markets()
     
-    analyzer = MarketAnalyzer()
+    analyzer = analyzer or MarketAnalyzer()
     high_return = analyzer.find_high_return_bets(markets, target_return=target_return)
     
     if not high_return:
@@ -134,29 +154,43 @@ def get_top_recommendation(target_return: float = 5.0):
     # Prefer certain categories (based on historical edge)
     priority_categories = ["economics", "politics", "finance", "weather"]
     
+    # First (highest-return) bet per lowercased category, built in one scan;
+    # markets without a category never match a priority bucket
+    first_by_category = {}
+    for bet in liquid_bets:
+        first_by_category.setdefault((bet["category"] or "").lower(), bet)
+    
     for cat in priority_categories:
-        for bet in liquid_bets:
-            if bet["category"].lower() == cat:
-                return bet
+        if cat in first_by_category:
+            return first_by_category[cat]
     
     # Default to highest return
     return liquid_bets[0]
 
 
 if __name__ == "__main__":
+    configure_cli_logging()
     import sys
     
     target = 5.0
     if len(sys.argv) > 1:
         target = float(sys.argv[1])
     
-    find_opportunities(target_return=target)
+    # Load (or fetch) once and share it: the recommendation reuses the same
+    # markets and analyzer instead of re-reading the cache or re-hitting the API
+    markets = load_latest_markets()
+    if not markets:
+        print("📊 Fetching fresh market data...")
+        markets = fetch_markets()
+    analyzer = MarketAnalyzer()
+    
+    find_opportunities(target_return=target, markets=markets, analyzer=analyzer)
     
     print("\n" + "="*60)
     print("🎯 TOP RECOMMENDATION")
     print("="*60)
     
-    top = get_top_recommendation(target_return=target)
+    top = get_top_recommendation(target_return=target, markets=markets, analyzer=analyzer)
     if top:
         print(f"\nTicker: {top['ticker']}")
         print(f"Market: {top['title']}")
@@ -3,13 +3,20 @@ Shared gate and telemetry calculations for paper-trading promotion.
 """
 from __future__ import annotations
 
-from statistics import mean
+from collections import defaultdict
+import operator
 from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
 from core.trading import compute_performance_metrics, to_probability
 
 
 def _safe_float(raw: Any, default: float = 0.0) -> float:
+    # Missing fields arrive as None; answering directly avoids raising and catching
+    # a TypeError, which costs ~10x a successful conversion.
+    if raw is None:
+        return default
+    if type(raw) is float:
+        return default if raw != raw else raw
     try:
         value = float(raw)
     except (TypeError, ValueError):
@@ -20,6 +27,10 @@ def _safe_float(raw: Any, default: float = 0.0) -> float:
 
 
 def _prob_or_none(raw: Any):
+    # Edges are usually stored as probability floats already; to_probability would
+    # return them unchanged, so skip the call.
+    if type(raw) is float and 0.0 <= raw <= 1.0:
+        return raw
     if raw is None:
         return None
     return to_probability(raw)
@@ -35,50 +46,46 @@ def compute_execution_cost_summary(
     total_pnl_cents = 0.0
     estimated_cost_cents = 0.0
     cost_coverage = 0
+    # Running sums and counts stand in for per-field lists; one pass, no second traversal.
+    gross_sum = net_sum = cost_sum = 0.0
+    gross_n = net_n = cost_n = 0
 
-    gross_edges: List[float] = []
-    net_edges: List[float] = []
-    cost_estimates: List[float] = []
-
-    for trade in closed_positions:
-        if not isinstance(trade, dict):
-            continue
-        notional = _safe_float(trade.get("notional_cents"), 0.0)
-        pnl = _safe_float(trade.get("pnl_cents", trade.get("pnl", 0.0)), 0.0)
-        total_notional_cents += max(0.0, notional)
-        total_pnl_cents += pnl
-
-        net_edge = _prob_or_none(trade.get("entry_edge"))
-        gross_edge = _prob_or_none(trade.get("entry_gross_edge"))
-        cost = _prob_or_none(trade.get("entry_cost_estimate"))
-
-        if gross_edge is None and net_edge is not None:
-            gross_edge = net_edge
-        if cost is None and gross_edge is not None and net_edge is not None:
-            cost = max(0.0, gross_edge - net_edge)
-
-        if net_edge is not None:
-            net_edges.append(net_edge)
-        if gross_edge is not None:
-            gross_edges.append(gross_edge)
-        if cost is not None:
-            cost_estimates.append(cost)
+    # Validate the row type once at the boundary; the loop then runs on dicts only.
+    trades = [trade for trade in closed_positions if isinstance(trade, dict)]
+    for trade in trades:
+        get = trade.get
+        total_notional_cents += max(0.0, _safe_float(get("notional_cents"), 0.0))
+        total_pnl_cents += _safe_float(get("pnl_cents", get("pnl", 0.0)), 0.0)
 
-        has_cost_telemetry = (
-            ("entry_edge" in trade)
-            or ("entry_gross_edge" in trade)
-            or ("entry_cost_estimate" in trade)
-        )
-        if has_cost_telemetry:
+        net = _prob_or_none(get("entry_edge"))
+        gross = _prob_or_none(get("entry_gross_edge"))
+        cost = _prob_or_none(get("entry_cost_estimate"))
+        if "entry_edge" in trade or "entry_gross_edge" in trade or "entry_cost_estimate" in trade:
             cost_coverage += 1
 
-        count = int(_safe_float(trade.get("count"), 0.0))
+        # A missing gross edge falls back to the net edge; a missing cost is gross - net.
+        if gross is None:
+            gross = net
+        if cost is None and gross is not None and net is not None:
+            cost = max(0.0, gross - net)
+
+        if gross is not None:
+            gross_sum += gross
+            gross_n += 1
+        if net is not None:
+            net_sum += net
+            net_n += 1
+        if cost is not None:
+            cost_sum += cost
+            cost_n += 1
+
+        count = int(_safe_float(get("count"), 0.0))
         if count > 0 and cost is not None:
             estimated_cost_cents += cost * 100.0 * count
 
-    avg_gross_edge = mean(gross_edges) if gross_edges else 0.0
-    avg_net_edge = mean(net_edges) if net_edges else 0.0
-    avg_cost = mean(cost_estimates) if cost_estimates else max(0.0, avg_gross_edge - avg_net_edge)
+    avg_gross_edge = gross_sum / gross_n if gross_n else 0.0
+    avg_net_edge = net_sum / net_n if net_n else 0.0
+    avg_cost = cost_sum / cost_n if cost_n else max(0.0, avg_gross_edge - avg_net_edge)
 
     total_trades = len(closed_positions)
     coverage_ratio = (cost_coverage / total_trades) if total_trades > 0 else 0.0
@@ -105,15 +112,15 @@ def compute_execution_cost_summary(
 
 
 def compute_ticker_concentration(closed_positions: Sequence[Dict[str, Any]]) -> Dict[str, Any]:
-    by_ticker: Dict[str, float] = {}
-    for trade in closed_positions:
-        if not isinstance(trade, dict):
-            continue
-        ticker = str(trade.get("ticker", "")).strip()
+    by_ticker: Dict[str, float] = defaultdict(float)
+    trades = [trade for trade in closed_positions if isinstance(trade, dict)]
+    for trade in trades:
+        get = trade.get
+        ticker = str(get("ticker", "")).strip()
         if not ticker:
             continue
-        pnl = _safe_float(trade.get("pnl_cents", trade.get("pnl", 0.0)), 0.0)
-        by_ticker[ticker] = by_ticker.get(ticker, 0.0) + pnl
+        pnl = _safe_float(get("pnl_cents", get("pnl", 0.0)), 0.0)
+        by_ticker[ticker] += pnl
 
     if not by_ticker:
         return {
@@ -125,9 +132,15 @@ def compute_ticker_concentration(closed_positions: Sequence[Dict[str, Any]]) ->
             "ticker_pnl_cents": {},
         }
 
-    total_abs = sum(abs(v) for v in by_ticker.values())
-    max_ticker = max(by_ticker, key=lambda t: abs(by_ticker[t]))
-    max_abs = abs(by_ticker[max_ticker])
+    # One reduction for both the total and the largest |pnl|; ties keep the first ticker seen.
+    total_abs = 0.0
+    max_ticker = None
+    max_abs = 0.0
+    for ticker, pnl in by_ticker.items():
+        abs_pnl = abs(pnl)
+        total_abs += abs_pnl
+        if max_ticker is None or abs_pnl > max_abs:
+            max_ticker, max_abs = ticker, abs_pnl
     share = (max_abs / total_abs) if total_abs > 0 else 0.0
     return {
         "ticker_count": len(by_ticker),
@@ -135,27 +148,110 @@ def compute_ticker_concentration(closed_positions: Sequence[Dict[str, Any]]) ->
         "max_abs_pnl_cents": max_abs,
         "total_abs_pnl_cents": total_abs,
         "max_share_of_abs_pnl": share,
-        "ticker_pnl_cents": by_ticker,
+        "ticker_pnl_cents": dict(by_ticker),
     }
 
 
+def compute_trailing_performance(
+    closed_positions: Sequence[Dict[str, Any]],
+    windows: Iterable[int],
+) -> Dict[int, Dict[str, float]]:
+    """
+    Trade-count, win and PnL figures for each trailing window that has enough
+    trades, using compute_performance_metrics' definitions for those keys.
+
+    One reverse scan serves every window: the trailing-w figures are the
+    running totals after w trades, so nested tails share their work.
+    """
+    checkpoints = {int(window) for window in windows if 0 < int(window) <= len(closed_positions)}
+    deepest = max(checkpoints, default=0)
+
+    by_window: Dict[int, Dict[str, float]] = {}
+    wins = 0
+    gross_profit = gross_loss = total_pnl = 0.0
+    return_total = 0.0
+    return_count = 0
+    for seen, trade in enumerate(reversed(closed_positions), 1):
+        if seen > deepest:
+            break
+        get = trade.get
+        pnl = float(get("pnl_cents", get("pnl", 0.0)) or 0.0)
+        if pnl > 0:
+            wins += 1
+            gross_profit += pnl
+        elif pnl < 0:
+            gross_loss -= pnl
+        total_pnl += pnl
+        notional = float(get("notional_cents", 0.0) or 0.0)
+        if notional > 0:
+            return_total += pnl / notional
+            return_count += 1
+        if seen in checkpoints:
+            if gross_loss > 0:
+                profit_factor = gross_profit / gross_loss
+            elif gross_profit > 0:
+                profit_factor = gross_profit
+            else:
+                profit_factor = 0.0
+            by_window[seen] = {
+                "trades": seen,
+                "wins": wins,
+                "win_rate": wins / seen,
+                "total_pnl_cents": total_pnl,
+                "expectancy_pct": (return_total / return_count if return_count else 0.0) * 100.0,
+                "profit_factor": profit_factor,
+            }
+    return by_window
+
+
 def compute_trailing_expectancy(
     closed_positions: Sequence[Dict[str, Any]],
     windows: Iterable[int],
 ) -> Dict[int, Optional[float]]:
+    sizes = [int(window) for window in windows]
+    by_window = compute_trailing_performance(closed_positions, sizes)
+
     result: Dict[int, Optional[float]] = {}
-    for window in windows:
-        window = int(window)
-        if window <= 0:
-            continue
-        if len(closed_positions) < window:
-            result[window] = None
-            continue
-        metrics = compute_performance_metrics(list(closed_positions[-window:]))
-        result[window] = float(metrics["expectancy_pct"])
+    for size in sizes:
+        if size > 0:
+            window_metrics = by_window.get(size)
+            result[size] = window_metrics["expectancy_pct"] if window_metrics else None
     return result
 
 
+_GATE_PASSES = {">=": operator.ge, ">": operator.gt, "<=": operator.le}
+
+
+def _gate_check(
+    name: str,
+    value: Any,
+    threshold: float,
+    direction: str,
+    *,
+    passed: Optional[bool] = None,
+) -> Dict[str, Any]:
+    """
+    One gate check row. Progress is value/threshold for ">=", threshold/value
+    for "<=", and all-or-nothing for ">".
+    """
+    if passed is None:
+        passed = bool(_GATE_PASSES[direction](value, threshold))
+    if direction == ">=":
+        progress = min(1.0, value / max(threshold, 1e-9))
+    elif direction == "<=":
+        progress = min(1.0, threshold / max(value, 1e-9))
+    else:
+        progress = 1.0 if passed else 0.0
+    return {
+        "name": name,
+        "pass": passed,
+        "value": value,
+        "threshold": threshold,
+        "direction": direction,
+        "progress": progress,
+    }
+
+
 def evaluate_go_live_gates(
     closed_positions: Sequence[Dict[str, Any]],
     *,
@@ -169,7 +265,13 @@ def evaluate_go_live_gates(
     max_concentration_share: float,
     fee_per_contract_prob: float,
     slippage_spread_factor: float,
+    full_report: bool = True,
 ) -> Dict[str, Any]:
+    """
+    Evaluate every go-live gate. With full_report=False the result stops after
+    the performance-metric gates when one of them fails: cost, concentration
+    and holdout passes are skipped and their sections are left empty.
+    """
     metrics = compute_performance_metrics(list(closed_positions))
     trades = int(metrics["trades"])
     expectancy = float(metrics["expectancy_pct"])
@@ -178,6 +280,25 @@ def evaluate_go_live_gates(
         float(metrics["max_drawdown_cents"]) / max(paper_bankroll * 100.0, 1.0) * 100.0
     )
 
+    # (name, value, threshold, direction); pass and progress follow from the direction.
+    specs: List[Tuple[str, float, float, str]] = [
+        ("trades", float(trades), float(min_trades), ">="),
+        ("expectancy_pct", expectancy, min_expectancy, ">"),
+        ("profit_factor", profit_factor, min_profit_factor, ">="),
+        ("max_drawdown_pct", max_drawdown_pct, max_drawdown, "<="),
+    ]
+    checks: List[Dict[str, Any]] = [_gate_check(*spec) for spec in specs]
+    if not full_report and not all(check["pass"] for check in checks):
+        return {
+            "metrics": metrics,
+            "max_drawdown_pct": max_drawdown_pct,
+            "checks": checks,
+            "go_live": False,
+            "cost_summary": {},
+            "concentration": {},
+            "holdout_expectancies": {},
+        }
+
     cost_summary = compute_execution_cost_summary(
         closed_positions,
         fee_per_contract_prob=fee_per_contract_prob,
@@ -186,76 +307,30 @@ def evaluate_go_live_gates(
     concentration = compute_ticker_concentration(closed_positions)
     holdout_expectancies = compute_trailing_expectancy(closed_positions, holdout_windows)
 
-    checks: List[Dict[str, Any]] = [
-        {
-            "name": "trades",
-            "pass": trades >= min_trades,
-            "value": float(trades),
-            "threshold": float(min_trades),
-            "direction": ">=",
-            "progress": min(1.0, trades / max(min_trades, 1)),
-        },
-        {
-            "name": "expectancy_pct",
-            "pass": expectancy > min_expectancy,
-            "value": expectancy,
-            "threshold": min_expectancy,
-            "direction": ">",
-            "progress": 1.0 if expectancy > min_expectancy else 0.0,
-        },
-        {
-            "name": "profit_factor",
-            "pass": profit_factor >= min_profit_factor,
-            "value": profit_factor,
-            "threshold": min_profit_factor,
-            "direction": ">=",
-            "progress": min(1.0, profit_factor / max(min_profit_factor, 1e-9)),
-        },
-        {
-            "name": "max_drawdown_pct",
-            "pass": max_drawdown_pct <= max_drawdown,
-            "value": max_drawdown_pct,
-            "threshold": max_drawdown,
-            "direction": "<=",
-            "progress": min(1.0, max_drawdown / max(max_drawdown_pct, 1e-9)),
-        },
-        {
-            "name": "cost_coverage_ratio",
-            "pass": float(cost_summary["cost_coverage_ratio"]) >= min_cost_coverage,
-            "value": float(cost_summary["cost_coverage_ratio"]),
-            "threshold": min_cost_coverage,
-            "direction": ">=",
-            "progress": min(
-                1.0,
-                float(cost_summary["cost_coverage_ratio"]) / max(min_cost_coverage, 1e-9),
-            ),
-        },
-    ]
+    checks.append(
+        _gate_check(
+            "cost_coverage_ratio",
+            float(cost_summary["cost_coverage_ratio"]),
+            min_cost_coverage,
+            ">=",
+        )
+    )
 
     for window in holdout_windows:
+        name = f"holdout_expectancy_{int(window)}"
         val = holdout_expectancies.get(int(window))
-        window_ready = val is not None
-        checks.append(
-            {
-                "name": f"holdout_expectancy_{int(window)}",
-                "pass": bool(window_ready and val > 0.0),
-                "value": val if val is not None else "insufficient_trades",
-                "threshold": 0.0,
-                "direction": ">",
-                "progress": 1.0 if bool(window_ready and val > 0.0) else 0.0,
-            }
-        )
+        if val is None:
+            checks.append(_gate_check(name, "insufficient_trades", 0.0, ">", passed=False))
+        else:
+            checks.append(_gate_check(name, val, 0.0, ">"))
 
-    concentration_share = float(concentration["max_share_of_abs_pnl"])
     checks.append(
-        {
-            "name": "max_ticker_concentration",
-            "pass": concentration_share <= max_concentration_share,
-            "value": concentration_share,
-            "threshold": max_concentration_share,
-            "direction": "<=",
-            "progress": min(1.0, max_concentration_share / max(concentration_share, 1e-9)),
-        }
+        _gate_check(
+            "max_ticker_concentration",
+            float(concentration["max_share_of_abs_pnl"]),
+            max_concentration_share,
+            "<=",
+        )
     )
 
     return {
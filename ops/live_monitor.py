@@ -6,11 +6,21 @@ import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
-from core.client import KalshiClient
+from core import jsonio
+from core.client import KalshiClient, configure_cli_logging
 from core.analyzer import MarketAnalyzer
 import time
-from datetime import datetime
-import json
+from pathlib import Path
+
+
+def _sleep_until_next_tick(next_tick: float, interval: int) -> float:
+    """Sleep to the next boundary of a fixed monotonic grid and return it"""
+    now = time.monotonic()
+    # After an overrun, restart the grid from now instead of bursting to catch up
+    next_tick = max(next_tick + interval, now)
+    if next_tick > now:
+        time.sleep(next_tick - now)
+    return next_tick
 
 
 def monitor_markets(interval: int = 60, alert_threshold: float = 0.20):
@@ -33,30 +43,38 @@ def monitor_markets(interval: int = 60, alert_threshold: float = 0.20):
     cycle = 0
     
     try:
+        # Cycles start every `interval` seconds; fetch and analysis time is not added on top
+        next_tick = time.monotonic()
         while True:
             cycle += 1
-            timestamp = datetime.utcnow().strftime("%H:%M:%S")
+            timestamp = time.strftime("%H:%M:%S", time.gmtime())
             print(f"[{timestamp}] Cycle #{cycle}")
             
             markets = client.get_markets(status="open", limit=100)
             
             if not markets:
                 print("  ⚠️  No markets fetched")
-                time.sleep(interval)
+                next_tick = _sleep_until_next_tick(next_tick, interval)
                 continue
             
             # Check for price movements
             alerts = []
+            # Rebuilt each cycle from the markets still listed, so delisted tickers drop out
+            # and the cache stays bounded by one fetch instead of growing for the whole run.
+            prices = {}
             
             for market in markets:
                 ticker = market.get("ticker")
                 price = market.get("last_price")
                 
                 if not price:
+                    # No print this cycle: carry the last known price while the market is listed
+                    if ticker in last_prices:
+                        prices[ticker] = last_prices[ticker]
                     continue
                 
-                if ticker in last_prices:
-                    prev_price = last_prices[ticker]
+                prev_price = last_prices.get(ticker)
+                if prev_price is not None:
                     change = (price - prev_price) / prev_price if prev_price > 0 else 0
                     
                     if abs(change) >= alert_threshold:
@@ -68,7 +86,9 @@ def monitor_markets(interval: int = 60, alert_threshold: float = 0.20):
                             "change": change,
                         })
                 
-                last_prices[ticker] = price
+                prices[ticker] = price
+            
+            last_prices = prices
             
             # Display alerts
             if alerts:
@@ -94,22 +114,22 @@ def monitor_markets(interval: int = 60, alert_threshold: float = 0.20):
             
             print(f"  ✓ {len(markets)} markets checked\n")
             
-            time.sleep(interval)
+            next_tick = _sleep_until_next_tick(next_tick, interval)
             
     except KeyboardInterrupt:
         print("\n👋 Monitor stopped")
         
-        # Save final state
-        with open("data/monitor_state.json", "w") as f:
-            json.dump({
-                "last_prices": last_prices,
-                "timestamp": datetime.utcnow().isoformat(),
-            }, f, indent=2)
+        # Save final state; swapped in atomically so a second Ctrl+C cannot truncate it
+        jsonio.dump_path(Path("data/monitor_state.json"), {
+            "last_prices": last_prices,
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime()),
+        }, indent=True)
         
         print("💾 State saved to data/monitor_state.json")
 
 
 if __name__ == "__main__":
+    configure_cli_logging()
     import sys
     
     interval = 60
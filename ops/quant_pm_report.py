@@ -13,7 +13,8 @@ import argparse
 import json
 from datetime import datetime, timezone
 from pathlib import Path
-from statistics import mean, median
+from math import fsum
+from statistics import median
 from typing import Any, Dict, List, Optional, Sequence
 
 import sys
@@ -21,7 +22,7 @@ import sys
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from core.trading import load_alpha_signals
-from ops.gate_metrics import evaluate_go_live_gates
+from ops.gate_metrics import compute_trailing_performance, evaluate_go_live_gates
 
 DEFAULT_FEE_PER_CONTRACT_PROB = 0.008
 DEFAULT_SLIPPAGE_SPREAD_FACTOR = 0.35
@@ -107,8 +108,9 @@ def compute_signal_quality(alpha_path: Path) -> Dict[str, Any]:
     )
     yes_bias = sum(1 for signal in signals.values() if signal.fair_yes_probability >= 0.5)
 
-    avg_conf = mean(confidences)
-    avg_conviction = mean(convictions)
+    # fsum keeps the sums correctly rounded without statistics.mean's exact Fraction path.
+    avg_conf = fsum(confidences) / len(confidences)
+    avg_conviction = fsum(convictions) / len(convictions)
     return {
         "signal_count": len(signals),
         "avg_confidence": avg_conf,
@@ -125,13 +127,13 @@ def compute_trailing_metrics(
     closed_positions: Sequence[Dict[str, Any]],
     windows: Sequence[int],
 ) -> List[Dict[str, float]]:
-    from core.trading import compute_performance_metrics
+    by_window = compute_trailing_performance(closed_positions, windows)
 
     result: List[Dict[str, float]] = []
     for window in windows:
-        if len(closed_positions) < window:
+        metrics = by_window.get(window)
+        if metrics is None:
             continue
-        metrics = compute_performance_metrics(list(closed_positions[-window:]))
         result.append(
             {
                 "window": float(window),
@@ -5,15 +5,16 @@ Deterministic replay harness for captured /markets/trades snapshots.
 from __future__ import annotations
 
 import argparse
-import json
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 import sys
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from automation.auto_trader import KalshiAutoTrader, TraderConfig
+from core import jsonio
+from core.client import configure_cli_logging
 from core.trading import AlphaSignal, MarketQuote, compute_performance_metrics
 from ops.build_flow_alpha import compute_trade_features, orderbook_imbalance, score_market
 
@@ -30,12 +31,7 @@ class SnapshotReplayTrader(KalshiAutoTrader):
         return True, f"replay-{action}-{ticker}-{count}"
 
     def _fetch_quotes(self):
-        quotes: List[MarketQuote] = []
-        for market in self.current_markets:
-            quote = MarketQuote.from_market(market)
-            if quote:
-                quotes.append(quote)
-        return quotes
+        return MarketQuote.from_markets(self.current_markets)
 
 
 def load_snapshots(path: Path) -> List[Dict[str, Any]]:
@@ -43,13 +39,15 @@ def load_snapshots(path: Path) -> List[Dict[str, Any]]:
         raise SystemExit(f"Snapshot file not found: {path}")
     snapshots: List[Dict[str, Any]] = []
     if path.suffix == ".jsonl":
-        for line in path.read_text().splitlines():
-            line = line.strip()
-            if not line:
-                continue
-            snapshots.append(json.loads(line))
+        # Stream raw byte lines straight into the parser; the file is never decoded to one str.
+        with path.open("rb") as handle:
+            for line in handle:
+                line = line.strip()
+                if not line:
+                    continue
+                snapshots.append(jsonio.loads(line))
     else:
-        payload = json.loads(path.read_text())
+        payload = jsonio.load_path(path)
         if isinstance(payload, list):
             snapshots = payload
         else:
@@ -59,10 +57,16 @@ def load_snapshots(path: Path) -> List[Dict[str, Any]]:
     return snapshots
 
 
-def build_snapshot_signals(snapshot: Dict[str, Any], min_confidence: float) -> Dict[str, AlphaSignal]:
+def score_snapshot(snapshot: Dict[str, Any]) -> List[Tuple[str, float, float]]:
+    """
+    (ticker, fair_yes_probability, confidence) for every scoreable market.
+
+    Depends only on the snapshot, so callers replaying the same snapshots
+    under several parameter sets can score them once and reuse the result.
+    """
     trades_by_ticker = snapshot.get("trades", {})
     books_by_ticker = snapshot.get("orderbooks", {})
-    signals: Dict[str, AlphaSignal] = {}
+    scored_markets: List[Tuple[str, float, float]] = []
 
     for market in snapshot.get("markets", []):
         quote = MarketQuote.from_market(market)
@@ -77,11 +81,25 @@ def build_snapshot_signals(snapshot: Dict[str, Any], min_confidence: float) -> D
             continue
         imbalance = orderbook_imbalance(books_by_ticker.get(ticker), depth=5)
         scored = score_market(quote, features, imbalance)
-        confidence = float(scored["confidence"])
+        scored_markets.append(
+            (ticker, float(scored["fair_yes_probability"]), float(scored["confidence"]))
+        )
+    return scored_markets
+
+
+def build_snapshot_signals(
+    snapshot: Dict[str, Any],
+    min_confidence: float,
+    scored: Optional[Sequence[Tuple[str, float, float]]] = None,
+) -> Dict[str, AlphaSignal]:
+    if scored is None:
+        scored = score_snapshot(snapshot)
+    signals: Dict[str, AlphaSignal] = {}
+    for ticker, fair_yes_probability, confidence in scored:
         if confidence < min_confidence:
             continue
         signals[ticker] = AlphaSignal(
-            fair_yes_probability=float(scored["fair_yes_probability"]),
+            fair_yes_probability=fair_yes_probability,
             confidence=confidence,
             source="replay_flow_v1",
         )
@@ -166,4 +184,5 @@ def main() -> None:
 
 
 if __name__ == "__main__":
+    configure_cli_logging()
     main()
@@ -9,28 +9,25 @@ import argparse
 from pathlib import Path
 import subprocess
 import sys
-from typing import List
+from typing import List, Optional, Sequence
 
 
 def run_command(
     cmd: List[str],
     *,
     cwd: Path,
-    stdin_text: str | None = None,
     check: bool = True,
 ) -> int:
     print(f"$ {' '.join(cmd)}")
     completed = subprocess.run(
         cmd,
         cwd=str(cwd),
-        input=stdin_text,
-        text=True,
         check=check,
     )
     return int(completed.returncode)
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Run end-to-end quant pipeline")
     parser.add_argument("--alpha-source", choices=["csv", "flow"], default="flow")
     parser.add_argument("--input", help="CSV input when --alpha-source=csv")
@@ -56,11 +53,11 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--gate-max-concentration-share", type=float, default=0.25)
 
     parser.add_argument("--deploy-live", action="store_true")
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 
-def main() -> None:
-    args = parse_args()
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
     root = Path(__file__).resolve().parent.parent
 
     # Step 1: Build alpha signals.
@@ -213,8 +210,8 @@ def main() -> None:
 
     # Step 5: Optional deploy.
     if args.deploy_live:
-        deploy_cmd = ["bash", "deploy_auto_trader.sh", "live"]
-        run_command(deploy_cmd, cwd=root, stdin_text="yes\n")
+        deploy_cmd = ["bash", "deploy_auto_trader.sh", "live", "--yes"]
+        run_command(deploy_cmd, cwd=root)
     else:
         print("Pipeline finished. Live deploy not requested.")
 
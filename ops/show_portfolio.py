@@ -6,7 +6,7 @@ import os
 import sys
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from core.client import KalshiClient
+from core.client import KalshiClient, configure_cli_logging
 
 def show_portfolio():
     client = KalshiClient(env='prod')
@@ -87,4 +87,5 @@ def show_portfolio():
 
 
 if __name__ == "__main__":
+    configure_cli_logging()
     show_portfolio()
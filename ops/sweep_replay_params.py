@@ -15,18 +15,20 @@ from datetime import datetime, timezone
 import itertools
 import json
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Sequence
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
 import sys
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from automation.auto_trader import TraderConfig
+from core.client import configure_cli_logging
 from core.trading import compute_performance_metrics
 from ops.replay_trades_backtest import (
     SnapshotReplayTrader,
     build_snapshot_signals,
     load_snapshots,
+    score_snapshot,
 )
 
 
@@ -42,7 +44,7 @@ class ReplayParams:
     max_holding_minutes: int
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: Optional[Sequence[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Sweep replay parameters on snapshot data")
     parser.add_argument("--snapshot-file", required=True)
     parser.add_argument("--out", help="Output JSON path (default data/replay_sweeps/<timestamp>.json)")
@@ -67,7 +69,7 @@ def parse_args() -> argparse.Namespace:
     parser.add_argument("--take-profit-grid", default="0.15,0.20,0.25")
     parser.add_argument("--stop-loss-grid", default="0.10,0.12,0.15")
     parser.add_argument("--max-holding-grid", default="120,240,360")
-    return parser.parse_args()
+    return parser.parse_args(argv)
 
 
 def _parse_float_grid(raw: str) -> List[float]:
@@ -153,6 +155,7 @@ def _build_trader_config(
 
 def _run_replay(
     snapshots: Sequence[Dict[str, Any]],
+    scored_snapshots: Sequence[List[Tuple[str, float, float]]],
     args: argparse.Namespace,
     params: ReplayParams,
     state_file: Path,
@@ -160,9 +163,9 @@ def _run_replay(
     if state_file.exists():
         state_file.unlink()
     trader = SnapshotReplayTrader(_build_trader_config(state_file=state_file, args=args, params=params))
-    for snapshot in snapshots:
+    for snapshot, scored in zip(snapshots, scored_snapshots):
         trader.current_markets = list(snapshot.get("markets", []))
-        signals = build_snapshot_signals(snapshot, min_confidence=params.min_confidence)
+        signals = build_snapshot_signals(snapshot, min_confidence=params.min_confidence, scored=scored)
         if signals:
             trader.check_exits(signals)
             candidates = trader._scan_candidates(signals)
@@ -219,8 +222,8 @@ def _default_out_path() -> Path:
     return Path("data/replay_sweeps") / f"{timestamp}.json"
 
 
-def main() -> None:
-    args = parse_args()
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    args = parse_args(argv)
     snapshots = load_snapshots(Path(args.snapshot_file))
     train_snapshots, holdout_snapshots = _split_train_holdout(
         snapshots=snapshots,
@@ -228,6 +231,11 @@ def main() -> None:
         min_holdout=int(args.min_holdout),
     )
 
+    # Market scoring does not depend on the swept parameters: score each snapshot once
+    # and let every grid run only apply its own min_confidence cut.
+    train_scored = [score_snapshot(snapshot) for snapshot in train_snapshots]
+    holdout_scored = [score_snapshot(snapshot) for snapshot in holdout_snapshots]
+
     out_path = Path(args.out) if args.out else _default_out_path()
     out_path.parent.mkdir(parents=True, exist_ok=True)
     run_dir = out_path.parent / f"{out_path.stem}_runs"
@@ -241,8 +249,12 @@ def main() -> None:
 
         train_state = run_dir / f"run_{idx:04d}_train_state.json"
         holdout_state = run_dir / f"run_{idx:04d}_holdout_state.json"
-        train = _run_replay(train_snapshots, args=args, params=params, state_file=train_state)
-        holdout = _run_replay(holdout_snapshots, args=args, params=params, state_file=holdout_state)
+        train = _run_replay(
+            train_snapshots, train_scored, args=args, params=params, state_file=train_state
+        )
+        holdout = _run_replay(
+            holdout_snapshots, holdout_scored, args=args, params=params, state_file=holdout_state
+        )
 
         run = {
             "run_id": idx,
@@ -289,4 +301,5 @@ def main() -> None:
 
 
 if __name__ == "__main__":
+    configure_cli_logging()
     main()
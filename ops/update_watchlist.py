@@ -9,7 +9,7 @@ from pathlib import Path
 import json
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
-from core.client import KalshiClient
+from core.client import KalshiClient, configure_cli_logging
 
 def update_watchlist():
     """Scan markets and update watchlist with opportunities"""
@@ -189,4 +189,5 @@ def update_watchlist():
 
 
 if __name__ == "__main__":
+    configure_cli_logging()
     update_watchlist()
@@ -0,0 +1,78 @@
+import argparse
+import unittest
+from unittest import mock
+
+from ops import build_flow_alpha
+
+
+def _market(ticker: str, *, volume: float, yes_bid: int, yes_ask: int) -> dict:
+    return {
+        "ticker": ticker,
+        "title": ticker,
+        "category": "test",
+        "volume": volume,
+        "yes_bid": yes_bid,
+        "yes_ask": yes_ask,
+        "no_bid": 100 - yes_ask,
+        "no_ask": 100 - yes_bid,
+    }
+
+
+class _StubClient:
+    def __init__(self, env: str = "prod") -> None:
+        self.trade_requests = []
+        self.book_requests = []
+
+    def get_markets(self, status: str = "open", limit: int = 100) -> list:
+        return [
+            _market("KXTEST-LIQUID", volume=5000, yes_bid=50, yes_ask=53),
+            _market("KXTEST-THIN", volume=100, yes_bid=50, yes_ask=53),
+            _market("KXTEST-WIDE", volume=5000, yes_bid=30, yes_ask=60),
+        ]
+
+    def get_market_trades(self, ticker: str, limit: int = 100) -> list:
+        self.trade_requests.append(ticker)
+        return [
+            {
+                "count": 10,
+                "side": "yes",
+                "yes_price": 50 + minute,
+                "created_time": f"2026-01-01T00:{minute:02d}:00Z",
+            }
+            for minute in range(6)
+        ]
+
+    def get_public_orderbook(self, ticker: str) -> dict:
+        self.book_requests.append(ticker)
+        return {"yes": [[52, 40]], "no": [[47, 10]]}
+
+
+class BuildFlowAlphaTests(unittest.TestCase):
+    def test_build_signals_fetches_only_prefiltered_markets(self) -> None:
+        args = argparse.Namespace(
+            env="demo",
+            calibration=None,
+            markets_limit=10,
+            trade_limit=50,
+            book_depth=5,
+            top_k=5,
+            min_market_volume=2500.0,
+            min_trades=3,
+            max_spread=0.08,
+            min_confidence=0.0,
+            source_tag="unit",
+            workers=2,
+        )
+        stub = _StubClient()
+        with mock.patch.object(build_flow_alpha, "KalshiClient", return_value=stub):
+            signals = build_flow_alpha.build_signals(args)
+
+        self.assertEqual(stub.trade_requests, ["KXTEST-LIQUID"])
+        self.assertEqual(stub.book_requests, ["KXTEST-LIQUID"])
+        self.assertEqual([signal["ticker"] for signal in signals], ["KXTEST-LIQUID"])
+        self.assertAlmostEqual(signals[0]["spread"], 0.03)
+        self.assertEqual(signals[0]["trade_count"], 6)
+
+
+if __name__ == "__main__":
+    unittest.main()
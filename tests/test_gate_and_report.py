@@ -100,6 +100,68 @@ class GateAndReportTests(unittest.TestCase):
         conc_check = [c for c in gate_fail["checks"] if c["name"] == "max_ticker_concentration"][0]
         self.assertFalse(conc_check["pass"])
 
+    def test_fail_fast_skips_costly_gates_after_metric_failure(self) -> None:
+        losing = [_make_closed_trade(ticker=f"KXTEST-{i % 4}", pnl_cents=-3.0) for i in range(50)]
+        kwargs = dict(
+            paper_bankroll=250.0,
+            min_trades=300,
+            min_expectancy=0.0,
+            min_profit_factor=1.15,
+            max_drawdown=25.0,
+            min_cost_coverage=0.95,
+            holdout_windows=[100, 200],
+            max_concentration_share=0.25,
+            fee_per_contract_prob=0.008,
+            slippage_spread_factor=0.35,
+        )
+        full = evaluate_go_live_gates(losing, **kwargs)
+        fast = evaluate_go_live_gates(losing, full_report=False, **kwargs)
+        self.assertFalse(fast["go_live"])
+        self.assertEqual(fast["checks"], full["checks"][: len(fast["checks"])])
+        self.assertEqual(
+            [c["name"] for c in fast["checks"]],
+            ["trades", "expectancy_pct", "profit_factor", "max_drawdown_pct"],
+        )
+        self.assertEqual(fast["cost_summary"], {})
+
+    def test_check_go_live_gate_full_and_fail_fast_modes(self) -> None:
+        tickers = [f"KXTEST-{i}" for i in range(8)]
+        passing = [
+            _make_closed_trade(ticker=tickers[idx % len(tickers)], pnl_cents=5.0 if idx % 5 else -2.0)
+            for idx in range(320)
+        ]
+        losing = [_make_closed_trade(ticker=f"KXTEST-{i % 4}", pnl_cents=-3.0) for i in range(50)]
+        with tempfile.TemporaryDirectory(prefix="kalshi-gate-modes-") as td:
+            root = Path(td)
+            for label, closed, expected_code in (("pass", passing, 0), ("fail", losing, 1)):
+                state_path = root / f"{label}_state.json"
+                state_path.write_text(json.dumps(self._make_state(closed)))
+                reports = {}
+                for mode, extra in (("full", []), ("fast", ["--fail-fast"])):
+                    json_out = root / f"{label}_{mode}.json"
+                    cmd = [
+                        "python3",
+                        "ops/check_go_live_gate.py",
+                        "--state",
+                        str(state_path),
+                        "--json-out",
+                        str(json_out),
+                        *extra,
+                    ]
+                    completed = subprocess.run(cmd, capture_output=True, text=True, check=False)
+                    self.assertEqual(completed.returncode, expected_code, msg=completed.stderr or completed.stdout)
+                    reports[mode] = json.loads(json_out.read_text())
+
+                full, fast = reports["full"], reports["fast"]
+                self.assertEqual(full["go_live"], fast["go_live"])
+                if expected_code == 0:
+                    # Nothing fails early, so both modes produce the same report.
+                    self.assertEqual(fast, full)
+                else:
+                    self.assertIn("max_ticker_concentration", [c["name"] for c in full["checks"]])
+                    self.assertEqual(fast["checks"], full["checks"][: len(fast["checks"])])
+                    self.assertEqual(len(fast["checks"]), 4)
+
     def test_quant_report_emits_json_verdict(self) -> None:
         with tempfile.TemporaryDirectory(prefix="kalshi-quant-report-") as td:
             root = Path(td)
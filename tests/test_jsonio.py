@@ -0,0 +1,42 @@
+import math
+import unittest
+from unittest import mock
+
+from core import jsonio
+
+PAYLOAD = {
+    "ticker": "KXTEST-1",
+    7: "int key",
+    "prices": [0.53, 1, None, True],
+    "nested": {"title": "Über temperature"},
+}
+
+
+class JsonioTests(unittest.TestCase):
+    def _round_trips(self) -> list:
+        return [
+            jsonio.loads(jsonio.dumps(PAYLOAD)),
+            jsonio.loads(jsonio.dumps(PAYLOAD, indent=True)),
+            jsonio.loads(jsonio.dumps_line(PAYLOAD)),
+        ]
+
+    @unittest.skipIf(jsonio.orjson is None, "orjson not installed")
+    def test_orjson_and_stdlib_backends_agree(self) -> None:
+        fast = self._round_trips()
+        with mock.patch.object(jsonio, "orjson", None):
+            stdlib = self._round_trips()
+        expected = {key if isinstance(key, str) else str(key): value for key, value in PAYLOAD.items()}
+        self.assertEqual(fast, [expected] * 3)
+        self.assertEqual(stdlib, fast)
+        self.assertTrue(jsonio.dumps_line(PAYLOAD).endswith(b"\n"))
+
+    @unittest.skipIf(jsonio.orjson is None, "orjson not installed")
+    def test_nan_is_null_under_orjson_and_nan_under_stdlib(self) -> None:
+        self.assertEqual(jsonio.loads(jsonio.dumps({"x": math.nan})), {"x": None})
+        with mock.patch.object(jsonio, "orjson", None):
+            value = jsonio.loads(jsonio.dumps({"x": math.nan}))["x"]
+        self.assertTrue(math.isnan(value))
+
+
+if __name__ == "__main__":
+    unittest.main()
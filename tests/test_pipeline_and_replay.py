@@ -1,9 +1,14 @@
+import contextlib
+import io
 import json
+import os
 import subprocess
 import tempfile
 import unittest
 from pathlib import Path
 
+from ops.continuous_build_until_pass import run_stage
+
 
 def _write_empty_snapshots(path: Path, count: int = 5) -> None:
     rows = []
@@ -129,6 +134,35 @@ class PipelineAndReplayTests(unittest.TestCase):
             payload = json.loads(pass_report_json.read_text())
             self.assertTrue(payload["go_live"])
 
+    def test_run_stage_maps_exits_and_restores_cwd(self) -> None:
+        start = os.getcwd()
+        seen = []
+
+        def ok(argv):
+            seen.append((os.getcwd(), list(argv)))
+
+        def exit_code(argv):
+            raise SystemExit(3)
+
+        def exit_message(argv):
+            raise SystemExit("stage refused")
+
+        def crash(argv):
+            raise RuntimeError("boom")
+
+        with tempfile.TemporaryDirectory(prefix="kalshi-run-stage-") as td:
+            stage_dir = Path(td).resolve()
+            with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+                self.assertEqual(run_stage("ok", ok, ["--flag"], cwd=stage_dir), 0)
+                self.assertEqual(run_stage("code", exit_code, [], cwd=stage_dir, check=False), 3)
+                self.assertEqual(run_stage("message", exit_message, [], cwd=stage_dir, check=False), 1)
+                self.assertEqual(run_stage("crash", crash, [], cwd=stage_dir, check=False), 1)
+                self.assertEqual(os.getcwd(), start)
+                with self.assertRaises(SystemExit):
+                    run_stage("checked", exit_code, [], cwd=stage_dir)
+            self.assertEqual(os.getcwd(), start)
+            self.assertEqual(seen, [(str(stage_dir), ["--flag"])])
+
 
 if __name__ == "__main__":
     unittest.main()
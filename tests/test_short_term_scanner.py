@@ -0,0 +1,58 @@
+import time
+import unittest
+
+from core.short_term_scanner import ShortTermScanner
+
+
+class ShortTermScannerTests(unittest.TestCase):
+    def test_data_driven_patterns_match_whole_words(self) -> None:
+        scanner = ShortTermScanner()
+        events = [
+            {"title": "BTC above $95k on Friday", "category": "Other"},
+            {"title": "Senate ethics committee vote", "category": "Politics"},
+            {"title": "Highest temperature in NYC", "category": "Other"},
+            {"title": "Recap of the Fed decisions", "category": "Politics"},
+            {"title": "Anything", "category": "Economics"},
+        ]
+        self.assertEqual(
+            [event["title"] for event in scanner.get_data_driven_markets(events)],
+            ["BTC above $95k on Friday", "Highest temperature in NYC", "Anything"],
+        )
+        self.assertEqual(scanner.get_data_driven_markets(), [])
+
+    def test_resolution_buckets_split_on_day_edges(self) -> None:
+        now = int(time.time())
+
+        def closing_in(seconds: int) -> dict:
+            stamp = time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(now + seconds))
+            return {"ticker": f"T{seconds}", "close_time": stamp}
+
+        hour, day = 3600, 86400
+        markets = [
+            closing_in(-hour),
+            closing_in(hour),
+            closing_in(day - hour),
+            closing_in(day + hour),
+            closing_in(7 * day - hour),
+            closing_in(7 * day + hour),
+            closing_in(14 * day - hour),
+            closing_in(14 * day + hour),
+            closing_in(31 * day - hour),
+            closing_in(31 * day + hour),
+            {"ticker": "UNDATED"},
+        ]
+        buckets = ShortTermScanner().categorize_by_resolution_speed(markets)
+        tickers = {name: [m["ticker"] for m in rows] for name, rows in buckets.items()}
+        self.assertEqual(
+            tickers,
+            {
+                "today": [f"T{hour}", f"T{day - hour}"],
+                "this_week": [f"T{day + hour}", f"T{7 * day - hour}"],
+                "next_week": [f"T{7 * day + hour}", f"T{14 * day - hour}"],
+                "this_month": [f"T{14 * day + hour}", f"T{31 * day - hour}"],
+            },
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,6 +1,12 @@
 import unittest
 
-from core.trading import AlphaSignal, apply_probability_calibration, to_probability
+from core.trading import (
+    AlphaSignal,
+    MarketQuote,
+    apply_probability_calibration,
+    apply_probability_calibration_batch,
+    to_probability,
+)
 
 
 class TradingProbabilityTests(unittest.TestCase):
@@ -29,12 +35,44 @@ class TradingProbabilityTests(unittest.TestCase):
         self.assertEqual(signal.horizon_minutes, 60)
         self.assertAlmostEqual(signal.expected_edge_net or 0.0, 0.02)
 
+    def test_alpha_signal_keeps_zero_probability(self) -> None:
+        signal = AlphaSignal.from_payload({"fair_yes_probability": 0.0, "fair_prob": 0.7})
+        self.assertIsNotNone(signal)
+        self.assertEqual(signal.fair_yes_probability, 0.0)
+
     def test_probability_calibration_is_piecewise_linear(self) -> None:
         bins = [(0.2, 0.25), (0.5, 0.55), (0.8, 0.75)]
         self.assertAlmostEqual(apply_probability_calibration(0.2, bins), 0.25)
         self.assertAlmostEqual(apply_probability_calibration(0.5, bins), 0.55)
         self.assertAlmostEqual(apply_probability_calibration(0.35, bins), 0.40)
 
+    def test_probability_calibration_batch_matches_scalar(self) -> None:
+        bins = [(0.8, 0.75), (0.2, 0.25), (0.5, 0.55)]
+        probabilities = [0.0, 0.2, 0.35, 0.65, 0.9]
+        expected = [apply_probability_calibration(p, bins) for p in probabilities]
+        self.assertEqual(apply_probability_calibration_batch(probabilities, bins), expected)
+
+    def test_market_quote_cache_does_not_serve_stale_quotes(self) -> None:
+        market = {
+            "ticker": "KXTEST-CACHE",
+            "title": "Cache test",
+            "category": "test",
+            "volume": 1000,
+            "yes_bid": 40,
+            "yes_ask": 42,
+            "no_bid": 58,
+            "no_ask": 60,
+        }
+        first = MarketQuote.from_market(market)
+        self.assertIs(MarketQuote.from_market(dict(market)), first)
+
+        moved = MarketQuote.from_market({**market, "yes_bid": 45, "yes_ask": 47})
+        self.assertAlmostEqual(moved.yes_bid, 0.45)
+        self.assertAlmostEqual(moved.yes_ask, 0.47)
+        traded = MarketQuote.from_market({**market, "volume": 2500})
+        self.assertEqual(traded.volume, 2500.0)
+        self.assertAlmostEqual(MarketQuote.from_market(market).yes_bid, 0.40)
+
 
 if __name__ == "__main__":
     unittest.main()